@@ -0,0 +1,71 @@
+"""rehash reddit_content.content_hash with BLAKE2b-128
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_reddit_content = sa.table(
+    "reddit_content",
+    sa.column("id"),
+    sa.column("normalized_text", sa.Text),
+    sa.column("content_hash", sa.String),
+)
+
+
+_BATCH_SIZE = 1000
+
+
+def _rehash(hash_text) -> None:
+    """Recompute every stored content_hash from normalized_text.
+
+    Walks the table in id order, one keyset page at a time, so only a
+    single batch of rows is held in memory.
+    """
+    conn = op.get_bind()
+    update = (
+        _reddit_content.update()
+        .where(_reddit_content.c.id == sa.bindparam("row_id"))
+        .values(content_hash=sa.bindparam("new_hash"))
+    )
+    last_id = None
+    while True:
+        query = sa.select(
+            _reddit_content.c.id, _reddit_content.c.normalized_text
+        ).order_by(_reddit_content.c.id).limit(_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(_reddit_content.c.id > last_id)
+        rows = conn.execute(query).all()
+        if not rows:
+            return
+        conn.execute(
+            update,
+            [
+                {"row_id": row_id, "new_hash": hash_text(text.encode("utf-8"))}
+                for row_id, text in rows
+            ],
+        )
+        if len(rows) < _BATCH_SIZE:
+            return
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    # Must match app.services.deduplicator.compute_content_hash
+    _rehash(lambda data: hashlib.blake2b(data, digest_size=16).hexdigest())
+
+
+def downgrade() -> None:
+    _rehash(lambda data: hashlib.sha256(data).hexdigest())
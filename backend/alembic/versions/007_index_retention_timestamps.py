@@ -0,0 +1,26 @@
+"""index retention cutoff columns
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_matches_detected_at"), "matches", ["detected_at"])
+    op.create_index(op.f("ix_reddit_content_fetched_at"), "reddit_content", ["fetched_at"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_reddit_content_fetched_at"), table_name="reddit_content")
+    op.drop_index(op.f("ix_matches_detected_at"), table_name="matches")
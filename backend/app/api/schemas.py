@@ -10,12 +10,15 @@ from urllib.parse import urlparse
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-# Subreddit names: alphanumeric + underscores, 1-50 chars
-_SUBREDDIT_RE = re.compile(r"^[A-Za-z0-9_]{1,50}$")
+# Subreddit names: alphanumeric + underscores, 1-50 chars (checked after lowercasing)
+_SUBREDDIT_RE = re.compile(r"[a-z0-9_]{1,50}", re.ASCII)
+
+# Hosts allowed to receive webhooks (SSRF prevention)
+_WEBHOOK_HOSTS = frozenset({"discord.com", "discordapp.com"})
 
 # Discord webhook URL pattern (SSRF prevention)
 _DISCORD_WEBHOOK_RE = re.compile(
-    r"^https://discord(?:app)?\.com/api/webhooks/\d+/[\w-]+$"
+    r"https://discord(?:app)?\.com/api/webhooks/\d+/[\w-]+"
 )
 
 # Input limits
@@ -55,6 +58,23 @@ def _check_ssrf(hostname: str) -> None:
             continue
 
 
+def _validate_webhook_url(v: str) -> str:
+    """Validate and normalize a Discord webhook URL, shared by create/update."""
+    v = v.strip()
+    if not v.startswith("https://"):
+        raise ValueError("Webhook URL must use HTTPS")
+    # Cheap host check first; only Discord URLs reach the regex and DNS
+    hostname = urlparse(v).hostname
+    if hostname not in _WEBHOOK_HOSTS or not _DISCORD_WEBHOOK_RE.fullmatch(v):
+        raise ValueError(
+            "Webhook URL must be a valid Discord webhook URL "
+            "(https://discord.com/api/webhooks/...)"
+        )
+    # SSRF prevention: resolve hostname and check for private IPs
+    _check_ssrf(hostname)
+    return v
+
+
 # --- Auth schemas ---
 
 class RegisterRequest(BaseModel):
@@ -197,7 +217,7 @@ class SubredditCreate(BaseModel):
             v = v[2:]
         if not v:
             raise ValueError("Subreddit name cannot be empty")
-        if not _SUBREDDIT_RE.match(v):
+        if not _SUBREDDIT_RE.fullmatch(v):
             raise ValueError(
                 "Subreddit name must contain only letters, numbers, "
                 "and underscores (max 50 chars)"
@@ -257,20 +277,7 @@ class WebhookCreate(BaseModel):
     @field_validator("url")
     @classmethod
     def validate_webhook_url(cls, v: str) -> str:
-        v = v.strip()
-        if not v.startswith("https://"):
-            raise ValueError("Webhook URL must use HTTPS")
-        if not _DISCORD_WEBHOOK_RE.match(v):
-            raise ValueError(
-                "Webhook URL must be a valid Discord webhook URL "
-                "(https://discord.com/api/webhooks/...)"
-            )
-        # SSRF prevention: resolve hostname and check for private IPs
-        parsed = urlparse(v)
-        hostname = parsed.hostname
-        if hostname:
-            _check_ssrf(hostname)
-        return v
+        return _validate_webhook_url(v)
 
 
 class WebhookUpdate(BaseModel):
@@ -282,18 +289,7 @@ class WebhookUpdate(BaseModel):
     @classmethod
     def validate_webhook_url(cls, v: Optional[str]) -> Optional[str]:
         if v is not None:
-            v = v.strip()
-            if not v.startswith("https://"):
-                raise ValueError("Webhook URL must use HTTPS")
-            if not _DISCORD_WEBHOOK_RE.match(v):
-                raise ValueError(
-                    "Webhook URL must be a valid Discord webhook URL "
-                    "(https://discord.com/api/webhooks/...)"
-                )
-            parsed = urlparse(v)
-            hostname = parsed.hostname
-            if hostname:
-                _check_ssrf(hostname)
+            v = _validate_webhook_url(v)
         return v
 
 
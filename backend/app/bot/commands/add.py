@@ -12,7 +12,7 @@ from ..utils import get_client_for_guild
 
 logger = logging.getLogger(__name__)
 
-_SUBREDDIT_RE = re.compile(r"^[A-Za-z0-9_]{1,50}$")
+_SUBREDDIT_RE = re.compile(r"[a-z0-9_]{1,50}", re.ASCII)
 
 
 class AddGroup(app_commands.Group):
@@ -97,7 +97,7 @@ class AddGroup(app_commands.Group):
             if sub_name.startswith("r/"):
                 sub_name = sub_name[2:]
 
-            if not sub_name or not _SUBREDDIT_RE.match(sub_name):
+            if not sub_name or not _SUBREDDIT_RE.fullmatch(sub_name):
                 await interaction.response.send_message(
                     "Invalid subreddit name. Use only letters, numbers, and underscores (max 50 chars).",
                     ephemeral=True,
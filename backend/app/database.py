@@ -2,7 +2,7 @@ import json
 import os
 from collections.abc import Generator
 
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session, sessionmaker
@@ -16,12 +16,24 @@ DATABASE_URL = os.getenv(
 _is_sqlite = DATABASE_URL.startswith("sqlite")
 _use_static_pool = os.getenv("SQLALCHEMY_STATIC_POOL", "").lower() == "true"
 
-_engine_kwargs: dict = {}
-if _is_sqlite:
-    _engine_kwargs["connect_args"] = {"check_same_thread": False}
-    if _use_static_pool:
-        _engine_kwargs["poolclass"] = StaticPool
 
+def _build_engine_kwargs(url: str, static_pool: bool = False) -> dict:
+    """Return the create_engine() keyword arguments for *url*."""
+    if url.startswith("sqlite"):
+        kwargs: dict = {"connect_args": {"check_same_thread": False}}
+        if static_pool:
+            kwargs["poolclass"] = StaticPool
+        return kwargs
+
+    kwargs = {"pool_pre_ping": True}
+    if make_url(url).get_driver_name() == "psycopg2":
+        # Page executemany UPDATEs (e.g. alert status flushes) through
+        # execute_batch instead of one round trip per row.
+        kwargs["executemany_mode"] = "values_plus_batch"
+    return kwargs
+
+
+if _is_sqlite:
     # --- SQLite ARRAY adapter (same as tests/conftest.py) ---
     @compiles(ARRAY, "sqlite")
     def _compile_array_sqlite(type_, compiler, **kw):
@@ -42,10 +54,8 @@ if _is_sqlite:
 
     ARRAY.bind_processor = _patched_bind
     ARRAY.result_processor = _patched_result
-else:
-    _engine_kwargs["pool_pre_ping"] = True
 
-engine = create_engine(DATABASE_URL, **_engine_kwargs)
+engine = create_engine(DATABASE_URL, **_build_engine_kwargs(DATABASE_URL, _use_static_pool))
 
 if _is_sqlite:
     @event.listens_for(engine, "connect")
@@ -32,6 +32,7 @@ class RedditContent(UUIDPrimaryKeyMixin, Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
+        index=True,
     )
     is_deleted = Column(Boolean, default=False, nullable=False)
 
@@ -38,6 +38,7 @@ class Match(UUIDPrimaryKeyMixin, Base):
         DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
+        index=True,
     )
     alert_sent_at = Column(DateTime(timezone=True), nullable=True)
     alert_status = Column(
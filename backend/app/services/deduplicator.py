@@ -5,22 +5,38 @@ Called by the poller before persisting new RedditContent records.
 """
 
 import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 
 from sqlalchemy.orm import Session
 
 from ..models.content import RedditContent
 
 
+# 128-bit digests: ample for dedup, and half the index size of SHA-256 hex.
+CONTENT_HASH_DIGEST_SIZE = 16
+
+
+# reddit_ids confirmed stored, remembered across polls (least recent evicted).
+KNOWN_ID_CACHE_SIZE = 50_000
+
+_known_ids: OrderedDict[str, None] = OrderedDict()
+_known_ids_lock = threading.Lock()
+
+
 def compute_content_hash(normalized_text: str) -> str:
-    """Compute a SHA-256 hash of normalized text for deduplication.
+    """Compute a BLAKE2b-128 hash of normalized text for deduplication.
 
     Args:
         normalized_text: Text that has already been run through the normalizer.
 
     Returns:
-        Hex-encoded SHA-256 digest.
+        Hex-encoded 16-byte BLAKE2b digest (32 characters).
     """
-    return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+    return hashlib.blake2b(
+        normalized_text.encode("utf-8"), digest_size=CONTENT_HASH_DIGEST_SIZE
+    ).hexdigest()
 
 
 def is_duplicate(db_session: Session, content_hash: str) -> bool:
@@ -28,7 +44,7 @@ def is_duplicate(db_session: Session, content_hash: str) -> bool:
 
     Args:
         db_session: Active SQLAlchemy session.
-        content_hash: SHA-256 hex digest to check.
+        content_hash: Hex digest from :func:`compute_content_hash`.
 
     Returns:
         True if a record with this hash already exists.
@@ -41,6 +57,60 @@ def is_duplicate(db_session: Session, content_hash: str) -> bool:
     )
 
 
+def find_existing_hashes(db_session: Session, content_hashes: Iterable[str]) -> set[str]:
+    """Return the subset of *content_hashes* already stored, in one query.
+
+    Batch counterpart of :func:`is_duplicate` for checking a whole poll's
+    worth of content at once.
+
+    Args:
+        db_session: Active SQLAlchemy session.
+        content_hashes: Hex digests from :func:`compute_content_hash`.
+
+    Returns:
+        Set of the given hashes that already exist in the database.
+    """
+    content_hashes = set(content_hashes)
+    if not content_hashes:
+        return set()
+    rows = (
+        db_session.query(RedditContent.content_hash)
+        .filter(RedditContent.content_hash.in_(content_hashes))
+        .all()
+    )
+    return {content_hash for (content_hash,) in rows}
+
+
+def remember_stored_ids(reddit_ids: Iterable[str]) -> None:
+    """Record reddit_ids that are known to be persisted.
+
+    Only call this with ids read from, or committed to, the database: the
+    cache is trusted to skip the existence check for these ids entirely.
+    """
+    with _known_ids_lock:
+        for reddit_id in reddit_ids:
+            _known_ids[reddit_id] = None
+            _known_ids.move_to_end(reddit_id)
+        while len(_known_ids) > KNOWN_ID_CACHE_SIZE:
+            _known_ids.popitem(last=False)
+
+
+def is_known_stored(reddit_id: str) -> bool:
+    """Return True if *reddit_id* was recently confirmed stored.
+
+    A False result means "unknown", not "new": the caller still has to
+    check the database.
+    """
+    with _known_ids_lock:
+        return reddit_id in _known_ids
+
+
+def clear_known_stored() -> None:
+    """Forget every remembered reddit_id."""
+    with _known_ids_lock:
+        _known_ids.clear()
+
+
 def mark_deleted(db_session: Session, reddit_id: str) -> bool:
     """Mark a piece of content as deleted if its source was removed from Reddit.
 
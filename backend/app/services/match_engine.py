@@ -8,8 +8,10 @@ database.
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
 from datetime import datetime, timezone
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.clients import Client
@@ -29,12 +31,22 @@ class MatchEngine:
     def __init__(self, db_session: Session) -> None:
         self.db = db_session
 
-    def process_content(self, content: RedditContent) -> list[Match]:
+    def process_content(
+        self,
+        content: RedditContent,
+        relevant: list[tuple[Client, Keyword, KeywordConfig]] | None = None,
+        existing: set[tuple] | None = None,
+    ) -> list[Match]:
         """Run a single piece of content against all relevant keywords.
 
+        *relevant* may carry the subreddit's (client, keyword, config)
+        triples and *existing* the already-stored (client_id, keyword_id,
+        content_id) match keys, when the caller has already loaded them.
+
         Returns a list of newly created Match records.
         """
-        relevant = self._get_relevant_keywords(content.subreddit)
+        if relevant is None:
+            relevant = self._get_relevant_configs(content.subreddit)
         if not relevant:
             return []
 
@@ -44,8 +56,7 @@ class MatchEngine:
         # also_matched across keywords for the same client.
         client_matches: dict[str, list[tuple[Keyword, MatchResult]]] = {}
 
-        for client, keyword in relevant:
-            config = self._keyword_to_config(keyword)
+        for client, keyword, config in relevant:
             results = find_matches(normalized, config)
             if results:
                 client_key = str(client.id)
@@ -55,6 +66,8 @@ class MatchEngine:
                     client_matches[client_key].append((keyword, r))
 
         created: list[Match] = []
+        if client_matches and existing is None:
+            existing = self._existing_match_keys([content.id])
 
         for client_key, kw_results in client_matches.items():
             # Determine also_matched per client: collect all distinct matched
@@ -68,14 +81,14 @@ class MatchEngine:
                 # client within a client_key group).
                 client = keyword.client
 
-                if self._match_exists(client.id, keyword.id, content.id):
+                if (client.id, keyword.id, content.id) in existing:
                     logger.debug(
                         "Skipping duplicate match: client=%s keyword=%s content=%s",
                         client.id, keyword.id, content.id,
                     )
                     continue
 
-                match_record = self._create_match_record(
+                match_record = self._build_match_record(
                     client=client,
                     keyword=keyword,
                     content=content,
@@ -85,16 +98,29 @@ class MatchEngine:
                 created.append(match_record)
 
         if created:
+            self.db.add_all(created)
             self.db.commit()
             logger.info("Created %d match(es) for content %s", len(created), content.reddit_id)
 
         return created
 
-    def process_batch(self, content_list: list[RedditContent]) -> list[Match]:
-        """Process multiple content items and return all created matches."""
+    def process_batch(self, content_list: Iterable[RedditContent]) -> list[Match]:
+        """Process multiple content items and return all created matches.
+
+        Keywords and matcher configs are loaded once per subreddit in the
+        batch rather than once per content item, and existing matches for
+        the whole batch are fetched in a single query.
+        """
+        content_list = list(content_list)
+        existing = self._existing_match_keys([c.id for c in content_list])
+        relevant_by_sub: dict[str, list[tuple[Client, Keyword, KeywordConfig]]] = {}
         all_matches: list[Match] = []
         for content in content_list:
-            matches = self.process_content(content)
+            relevant = relevant_by_sub.get(content.subreddit)
+            if relevant is None:
+                relevant = self._get_relevant_configs(content.subreddit)
+                relevant_by_sub[content.subreddit] = relevant
+            matches = self.process_content(content, relevant, existing)
             all_matches.extend(matches)
         return all_matches
 
@@ -129,6 +155,15 @@ class MatchEngine:
 
         return pairs
 
+    def _get_relevant_configs(
+        self, subreddit: str
+    ) -> list[tuple[Client, Keyword, KeywordConfig]]:
+        """Pair each relevant client/keyword with its matcher config."""
+        return [
+            (client, keyword, self._keyword_to_config(keyword))
+            for client, keyword in self._get_relevant_keywords(subreddit)
+        ]
+
     @staticmethod
     def _keyword_to_config(keyword: Keyword) -> KeywordConfig:
         """Convert a Keyword DB model to a matcher KeywordConfig dataclass.
@@ -147,31 +182,29 @@ class MatchEngine:
             use_stemming=keyword.use_stemming,
         )
 
-    def _match_exists(self, client_id, keyword_id, content_id) -> bool:
-        """Check if a match with this (client, keyword, content) triple already exists."""
-        return (
-            self.db.query(Match.id)
-            .filter(
-                Match.client_id == client_id,
-                Match.keyword_id == keyword_id,
-                Match.content_id == content_id,
+    def _existing_match_keys(self, content_ids: list) -> set[tuple]:
+        """Return the (client_id, keyword_id, content_id) triples already stored."""
+        if not content_ids:
+            return set()
+        rows = self.db.execute(
+            select(Match.client_id, Match.keyword_id, Match.content_id).where(
+                Match.content_id.in_(content_ids)
             )
-            .first()
-            is not None
         )
+        return set(rows.tuples())
 
-    def _create_match_record(
-        self,
+    @staticmethod
+    def _build_match_record(
         client: Client,
         keyword: Keyword,
         content: RedditContent,
         match_result: MatchResult,
         also_matched: list[str] | None = None,
     ) -> Match:
-        """Persist a Match record to the database."""
+        """Build a pending Match record; the caller adds it to the session."""
         reddit_url = f"https://reddit.com/r/{content.subreddit}/comments/{content.reddit_id}"
 
-        match = Match(
+        return Match(
             client_id=client.id,
             keyword_id=keyword.id,
             content_id=content.id,
@@ -188,5 +221,3 @@ class MatchEngine:
             detected_at=datetime.now(timezone.utc),
             alert_status=AlertStatus.pending,
         )
-        self.db.add(match)
-        return match
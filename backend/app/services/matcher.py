@@ -5,16 +5,22 @@ phrase tokens appear within a configurable proximity window. Supports OR
 groups, negations, ordering constraints, and optional stemming.
 """
 
-import re
+import bisect
+import functools
+import itertools
 from dataclasses import dataclass, field
-from typing import Optional
 
 from .normalizer import NormalizedResult
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class KeywordConfig:
-    """Configuration for a keyword matching rule."""
+    """Configuration for a keyword matching rule.
+
+    Frozen: the matcher-ready fields below are derived from the rule once,
+    at construction, so the rule itself cannot be changed afterwards. Build
+    a new config instead.
+    """
     phrases: list[list[str]]  # OR groups: each phrase is a list of tokens
     exclusions: list[str] = field(default_factory=list)
     proximity_window: int = 15
@@ -22,8 +28,45 @@ class KeywordConfig:
     use_stemming: bool = False
     exclusion_scope: str = "anywhere"  # "anywhere" or "proximity"
 
+    # Matcher-ready forms of the rule, computed once per config so the hot
+    # loop in find_matches() carries no per-call normalization or branching
+    # on settings: lowercased (and stemmed, if enabled) tokens of each
+    # non-empty phrase, its display label, and the exclusion terms split by
+    # the scope they apply to.
+    _phrase_tokens: list[list[str]] = field(init=False, repr=False, compare=False)
+    _phrase_labels: list[str] = field(init=False, repr=False, compare=False)
+    _anywhere_exclusions: frozenset[str] = field(init=False, repr=False, compare=False)
+    _proximity_exclusions: frozenset[str] = field(init=False, repr=False, compare=False)
+    _vocabulary: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        phrases = [p for p in self.phrases if p]
+        if self.use_stemming:
+            phrase_tokens = [[_stem(t.lower()) for t in p] for p in phrases]
+            exclusion_terms = frozenset(_stem(e.lower()) for e in self.exclusions)
+        else:
+            phrase_tokens = [[t.lower() for t in p] for p in phrases]
+            exclusion_terms = frozenset(e.lower() for e in self.exclusions)
+
+        empty: frozenset[str] = frozenset()
+        if self.exclusion_scope == "anywhere":
+            anywhere, proximity = exclusion_terms, empty
+        elif self.exclusion_scope == "proximity":
+            anywhere, proximity = empty, exclusion_terms
+        else:
+            anywhere = proximity = empty
+
+        # Frozen dataclass: the derived fields are set past __setattr__
+        object.__setattr__(self, "_phrase_tokens", phrase_tokens)
+        object.__setattr__(self, "_phrase_labels", [" ".join(p) for p in phrases])
+        object.__setattr__(
+            self, "_vocabulary", frozenset(t for p in phrase_tokens for t in p)
+        )
+        object.__setattr__(self, "_anywhere_exclusions", anywhere)
+        object.__setattr__(self, "_proximity_exclusions", proximity)
+
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
     """A single match found in content."""
     matched_phrase: str
@@ -65,7 +108,10 @@ def _simple_stem(word: str) -> str:
     return word
 
 
-_TOKEN_PATTERN = re.compile(r"[a-z0-9'-]+")
+@functools.lru_cache(maxsize=65536)
+def _stem(word: str) -> str:
+    """Memoized ``_simple_stem``; Reddit text repeats its vocabulary heavily."""
+    return _simple_stem(word)
 
 
 def _build_token_index(tokens: list[str], text: str) -> list[int]:
@@ -78,12 +124,7 @@ def _build_token_index(tokens: list[str], text: str) -> list[int]:
     for token in tokens:
         idx = text.find(token, search_start)
         if idx == -1:
-            # Fallback: use the pattern matcher
-            m = re.search(re.escape(token), text[search_start:])
-            if m:
-                idx = search_start + m.start()
-            else:
-                idx = search_start
+            idx = search_start
         positions.append(idx)
         search_start = idx + len(token)
     return positions
@@ -160,41 +201,41 @@ def find_matches(
 
     tokens = content.tokens
     text = content.normalized_text
-    token_offsets = _build_token_index(tokens, text)
 
     # Optionally stem content tokens
     if keyword.use_stemming:
-        stemmed_tokens = [_simple_stem(t) for t in tokens]
+        stemmed_tokens = [_stem(t) for t in tokens]
     else:
         stemmed_tokens = tokens
 
+    # Most content mentions none of the keyword's terms: reject it with a
+    # single set operation across all phrases before any per-phrase work.
+    if keyword._vocabulary.isdisjoint(stemmed_tokens):
+        return []
+
     # Check "anywhere" exclusions up front
-    if keyword.exclusions and keyword.exclusion_scope == "anywhere":
-        if keyword.use_stemming:
-            exclusion_stems = {_simple_stem(e.lower()) for e in keyword.exclusions}
-            if any(st in exclusion_stems for st in stemmed_tokens):
-                return []
-        else:
-            exclusion_set = {e.lower() for e in keyword.exclusions}
-            if any(t in exclusion_set for t in tokens):
-                return []
+    if keyword._anywhere_exclusions:
+        if not keyword._anywhere_exclusions.isdisjoint(stemmed_tokens):
+            return []
 
-    results: list[MatchResult] = []
+    if len(content.char_offsets) == len(tokens):
+        token_offsets = content.char_offsets
+    else:
+        # Hand-built NormalizedResult without offsets: recover them by search
+        token_offsets = _build_token_index(tokens, text)
 
-    for phrase_tokens in keyword.phrases:
-        if not phrase_tokens:
-            continue
+    # One pass over the content maps every token to its positions, so each
+    # phrase token is a dict lookup rather than another scan of the text.
+    positions_by_token: dict[str, list[int]] = {}
+    for i, t in enumerate(stemmed_tokens):
+        positions_by_token.setdefault(t, []).append(i)
 
-        phrase_lower = [t.lower() for t in phrase_tokens]
-        if keyword.use_stemming:
-            phrase_stemmed = [_simple_stem(t) for t in phrase_lower]
-        else:
-            phrase_stemmed = phrase_lower
+    results: list[MatchResult] = []
+    proximity_exclusions = keyword._proximity_exclusions
 
+    for phrase_str, phrase_stemmed in zip(keyword._phrase_labels, keyword._phrase_tokens):
         phrase_matches = _find_phrase_matches(
-            stemmed_tokens=stemmed_tokens,
-            token_offsets=token_offsets,
-            tokens=tokens,
+            positions_by_token=positions_by_token,
             phrase_stemmed=phrase_stemmed,
             proximity_window=keyword.proximity_window,
             require_order=keyword.require_order,
@@ -202,16 +243,13 @@ def find_matches(
 
         for matched_token_indices in phrase_matches:
             # Check proximity-scoped exclusions
-            if keyword.exclusions and keyword.exclusion_scope == "proximity":
-                if _has_proximity_exclusion(
-                    stemmed_tokens=stemmed_tokens,
-                    tokens=tokens,
-                    matched_indices=matched_token_indices,
-                    exclusions=keyword.exclusions,
-                    window=keyword.proximity_window,
-                    use_stemming=keyword.use_stemming,
-                ):
-                    continue
+            if proximity_exclusions and _has_proximity_exclusion(
+                stemmed_tokens=stemmed_tokens,
+                matched_indices=matched_token_indices,
+                exclusion_terms=proximity_exclusions,
+                window=keyword.proximity_window,
+            ):
+                continue
 
             # Calculate span in the original text
             span_start = token_offsets[matched_token_indices[0]]
@@ -221,7 +259,6 @@ def find_matches(
             snippet = _generate_snippet(text, span_start, span_end)
             score = _calculate_proximity_score(matched_token_indices, len(tokens))
 
-            phrase_str = " ".join(phrase_tokens)
             results.append(MatchResult(
                 matched_phrase=phrase_str,
                 span_start=span_start,
@@ -234,9 +271,7 @@ def find_matches(
 
 
 def _find_phrase_matches(
-    stemmed_tokens: list[str],
-    token_offsets: list[int],
-    tokens: list[str],
+    positions_by_token: dict[str, list[int]],
     phrase_stemmed: list[str],
     proximity_window: int,
     require_order: bool,
@@ -246,35 +281,41 @@ def _find_phrase_matches(
     For single-token phrases, returns each position where the token appears.
     For multi-token phrases, finds combinations within the proximity window.
 
+    Args:
+        positions_by_token: Map of each (stemmed) content token to the
+            ascending list of indices at which it occurs.
+
     Returns a list of lists, where each inner list contains the token indices
     that form a match.
     """
     if len(phrase_stemmed) == 1:
         # Single-token phrase: find all occurrences
-        target = phrase_stemmed[0]
-        return [[i] for i, t in enumerate(stemmed_tokens) if t == target]
+        return [[i] for i in positions_by_token.get(phrase_stemmed[0], ())]
 
     # Multi-token phrase: find positions of each phrase token
     token_positions: list[list[int]] = []
     for pt in phrase_stemmed:
-        positions = [i for i, t in enumerate(stemmed_tokens) if t == pt]
+        positions = positions_by_token.get(pt)
         if not positions:
             return []  # A required token is missing entirely
         token_positions.append(positions)
 
     # Find valid combinations within proximity window
-    # Use the first token's positions as anchors and search for combinations
+    # Use the first token's positions as anchors and search for combinations.
+    # Each anchor gets one list that the search extends and backtracks in
+    # place; it is only kept when it completes into a match.
     matches: list[list[int]] = []
     for anchor_pos in token_positions[0]:
-        combo = _find_combination(
+        combo = [anchor_pos]
+        if _find_combination(
             token_positions=token_positions,
-            anchor_pos=anchor_pos,
             proximity_window=proximity_window,
             require_order=require_order,
-            current_combo=[anchor_pos],
+            combo=combo,
             token_idx=1,
-        )
-        if combo is not None:
+            lowest=anchor_pos,
+            highest=anchor_pos,
+        ):
             matches.append(combo)
 
     return matches
@@ -282,67 +323,70 @@ def _find_phrase_matches(
 
 def _find_combination(
     token_positions: list[list[int]],
-    anchor_pos: int,
     proximity_window: int,
     require_order: bool,
-    current_combo: list[int],
+    combo: list[int],
     token_idx: int,
-) -> Optional[list[int]]:
-    """Recursively find a valid token combination within the proximity window."""
+    lowest: int,
+    highest: int,
+) -> bool:
+    """Recursively extend ``combo`` into a valid combination within the window.
+
+    ``combo`` is mutated in place and holds the full combination when this
+    returns True. ``lowest``/``highest`` are the current bounds of ``combo``,
+    tracked incrementally so no candidate list is built just to measure it.
+    """
     if token_idx >= len(token_positions):
-        return current_combo
+        return True
 
-    for pos in token_positions[token_idx]:
-        # Check proximity: all tokens must be within proximity_window of each other
-        all_positions = current_combo + [pos]
-        span = max(all_positions) - min(all_positions)
-        if span >= proximity_window:
-            continue
+    positions = token_positions[token_idx]
+    # Positions are ascending, so the proximity window (all tokens within
+    # proximity_window of each other) is a contiguous slice of candidates.
+    start = bisect.bisect_left(positions, highest - proximity_window + 1)
+    if require_order:
+        start = max(start, bisect.bisect_right(positions, combo[-1]))
 
-        # Check ordering if required
-        if require_order and pos <= current_combo[-1]:
-            continue
+    for pos in itertools.islice(positions, start, None):
+        if pos - lowest >= proximity_window:
+            break
 
         # Avoid using the same position twice
-        if pos in current_combo:
+        if pos in combo:
             continue
 
-        result = _find_combination(
+        combo.append(pos)
+        if _find_combination(
             token_positions=token_positions,
-            anchor_pos=anchor_pos,
             proximity_window=proximity_window,
             require_order=require_order,
-            current_combo=all_positions,
+            combo=combo,
             token_idx=token_idx + 1,
-        )
-        if result is not None:
-            return result
+            lowest=min(lowest, pos),
+            highest=max(highest, pos),
+        ):
+            return True
+        combo.pop()
 
-    return None
+    return False
 
 
 def _has_proximity_exclusion(
     stemmed_tokens: list[str],
-    tokens: list[str],
     matched_indices: list[int],
-    exclusions: list[str],
+    exclusion_terms: frozenset[str],
     window: int,
-    use_stemming: bool,
 ) -> bool:
-    """Check if any exclusion word appears within the proximity window of the match."""
-    if use_stemming:
-        exclusion_set = {_simple_stem(e.lower()) for e in exclusions}
-        check_tokens = stemmed_tokens
-    else:
-        exclusion_set = {e.lower() for e in exclusions}
-        check_tokens = tokens
+    """Check if any exclusion word appears within the proximity window of the match.
 
+    ``stemmed_tokens`` and ``exclusion_terms`` must be in the same form: both
+    stemmed when the keyword uses stemming, both plain lowercase otherwise.
+    """
     match_min = min(matched_indices)
     match_max = max(matched_indices)
     window_start = max(0, match_min - window)
-    window_end = min(len(check_tokens), match_max + window + 1)
+    window_end = min(len(stemmed_tokens), match_max + window + 1)
 
     for i in range(window_start, window_end):
-        if check_tokens[i] in exclusion_set:
+        if stemmed_tokens[i] in exclusion_terms:
             return True
     return False
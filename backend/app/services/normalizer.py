@@ -6,27 +6,46 @@ into a normalized form suitable for keyword matching.
 
 import re
 from dataclasses import dataclass, field
+from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedResult:
-    """Result of normalizing a piece of text."""
+    """Result of normalizing a piece of text.
+
+    ``sentences`` is segmented lazily on first access: the matcher only needs
+    tokens, so the sentence split is skipped unless something asks for it.
+    """
     normalized_text: str
     tokens: list[str] = field(default_factory=list)
-    sentences: list[str] = field(default_factory=list)
+    # Start offset of each token within normalized_text (parallel to tokens)
+    char_offsets: list[int] = field(default_factory=list)
+    # Sentence cache; None means "not segmented yet"
+    _sentences: Optional[list[str]] = field(
+        init=False, default=None, repr=False, compare=False
+    )
+
+    @property
+    def sentences(self) -> list[str]:
+        if self._sentences is None:
+            self._sentences = _segment_sentences(self.normalized_text)
+        return self._sentences
 
 
 # Regex patterns compiled once at module level
 _URL_PATTERN = re.compile(r'https?://\S+')
 _REDDIT_LINK_PATTERN = re.compile(r'\[([^\]]*)\]\([^)]*\)')
-_BOLD_PATTERN = re.compile(r'\*\*(.+?)\*\*')
-_ITALIC_PATTERN = re.compile(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)')
-_STRIKETHROUGH_PATTERN = re.compile(r'~~(.+?)~~')
-_INLINE_CODE_PATTERN = re.compile(r'`([^`]+)`')
 _BLOCKQUOTE_PATTERN = re.compile(r'^>\s?', re.MULTILINE)
 _HEADING_PATTERN = re.compile(r'^#{1,6}\s+', re.MULTILINE)
 _HORIZONTAL_RULE_PATTERN = re.compile(r'^[-*_]{3,}\s*$', re.MULTILINE)
-_SUPERSCRIPT_PATTERN = re.compile(r'\^(\S+)')
+# Any character/sequence one of the markdown or URL patterns above could act
+# on; text without one is passed straight through to whitespace cleanup.
+_NEEDS_STRIP_PATTERN = re.compile(r'[*~`\[>#^]|[-_]{3}|https?://')
+# Emphasis, strikethrough, inline code and superscript markers become spaces
+# in one C-level pass instead of a regex substitution per construct. Spaces,
+# not deletion, so an unpaired operator ("a*b", "2^10") still splits tokens;
+# whitespace cleanup collapses the rest.
+_INLINE_MARKUP_TABLE = str.maketrans('*~`^', '    ')
 _WHITESPACE_PATTERN = re.compile(r'\s+')
 _SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
 _TOKEN_PATTERN = re.compile(r"[a-z0-9'-]+")
@@ -41,7 +60,7 @@ def normalize_text(raw_text: str) -> NormalizedResult:
     3. Strip Reddit markdown formatting
     4. Normalize whitespace
     5. Tokenize into words
-    6. Segment into sentences
+    6. Segment into sentences (deferred until ``sentences`` is read)
 
     Args:
         raw_text: Raw text from a Reddit post or comment.
@@ -50,20 +69,24 @@ def normalize_text(raw_text: str) -> NormalizedResult:
         NormalizedResult with cleaned text, tokens, and sentences.
     """
     if not raw_text or not raw_text.strip():
-        return NormalizedResult(normalized_text="", tokens=[], sentences=[])
+        return NormalizedResult(normalized_text="", tokens=[])
 
     text = raw_text.lower()
-    text = _strip_markdown(text)
-    text = _strip_urls(text)
+    # Most comments are plain prose: one scan instead of ten substitutions
+    if _NEEDS_STRIP_PATTERN.search(text):
+        text = _strip_markdown(text)
+        text = _strip_urls(text)
+        # Only once URLs are gone: a '~' or '*' in a URL path would otherwise
+        # become a space and leave the rest of the URL behind as tokens
+        text = _strip_inline_markup(text)
     text = _normalize_whitespace(text)
 
-    tokens = _tokenize(text)
-    sentences = _segment_sentences(text)
+    tokens, char_offsets = _tokenize(text)
 
     return NormalizedResult(
         normalized_text=text,
         tokens=tokens,
-        sentences=sentences,
+        char_offsets=char_offsets,
     )
 
 
@@ -76,23 +99,18 @@ def _strip_markdown(text: str) -> str:
     """Remove Reddit markdown formatting, keeping the inner text."""
     # Links: [text](url) -> text
     text = _REDDIT_LINK_PATTERN.sub(r'\1', text)
-    # Bold: **text** -> text
-    text = _BOLD_PATTERN.sub(r'\1', text)
-    # Italic: *text* -> text
-    text = _ITALIC_PATTERN.sub(r'\1', text)
-    # Strikethrough: ~~text~~ -> text
-    text = _STRIKETHROUGH_PATTERN.sub(r'\1', text)
-    # Inline code: `text` -> text
-    text = _INLINE_CODE_PATTERN.sub(r'\1', text)
     # Blockquotes: > text -> text
     text = _BLOCKQUOTE_PATTERN.sub('', text)
     # Headings: ## text -> text
     text = _HEADING_PATTERN.sub('', text)
-    # Horizontal rules
-    text = _HORIZONTAL_RULE_PATTERN.sub('', text)
-    # Superscript: ^word -> word
-    text = _SUPERSCRIPT_PATTERN.sub(r'\1', text)
-    return text
+    # Horizontal rules (before '*' is dropped, so '***' rules still match)
+    return _HORIZONTAL_RULE_PATTERN.sub('', text)
+
+
+def _strip_inline_markup(text: str) -> str:
+    """Replace emphasis, strikethrough, code and superscript markers with spaces."""
+    # **bold**, *italic*, ~~strike~~, `code`, ^super -> inner text (spaced)
+    return text.translate(_INLINE_MARKUP_TABLE)
 
 
 def _normalize_whitespace(text: str) -> str:
@@ -100,9 +118,17 @@ def _normalize_whitespace(text: str) -> str:
     return _WHITESPACE_PATTERN.sub(' ', text).strip()
 
 
-def _tokenize(text: str) -> list[str]:
-    """Split text into word tokens, stripping punctuation."""
-    return _TOKEN_PATTERN.findall(text)
+def _tokenize(text: str) -> tuple[list[str], list[int]]:
+    """Split text into word tokens, stripping punctuation.
+
+    Returns the tokens together with each token's start offset in *text*.
+    """
+    tokens: list[str] = []
+    offsets: list[int] = []
+    for m in _TOKEN_PATTERN.finditer(text):
+        tokens.append(m.group())
+        offsets.append(m.start())
+    return tokens, offsets
 
 
 def _segment_sentences(text: str) -> list[str]:
@@ -8,25 +8,137 @@ content, deduplicates, and persists RedditContent records.
 """
 
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
+import orjson
 from sqlalchemy import distinct
 from sqlalchemy.orm import Session
 
 from ..models.content import ContentType, RedditContent
 from ..models.subreddits import MonitoredSubreddit, SubredditStatus
-from .deduplicator import compute_content_hash, is_duplicate
+from .deduplicator import (
+    compute_content_hash,
+    find_existing_hashes,
+    is_known_stored,
+    remember_stored_ids,
+)
 from .normalizer import normalize_text
 
 logger = logging.getLogger(__name__)
 
 REDDIT_BASE_URL = "https://www.reddit.com"
 DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; Reddalert/1.0)"
-# Small delay between the posts and comments requests to stay under rate limits.
+# Fallback spacing between requests when Reddit sends no rate-limit headers.
 REQUEST_DELAY = 1.0
+# Below this many remaining requests in the window, spread out the rest.
+RATE_LIMIT_LOW_WATER = 5
+# Upper bound on subreddits fetched concurrently by poll_all_active.
+MAX_POLL_WORKERS = 8
+# Minimum spacing between any two Reddit requests, across all poll threads.
+MIN_REQUEST_INTERVAL = 0.5
+
+
+class _RequestPacer:
+    """Spaces out Reddit requests made from any poll thread.
+
+    Each caller reserves its send slot under the lock and then sleeps outside
+    it until that slot arrives. Slots are at least MIN_REQUEST_INTERVAL
+    apart. Reddit's rate-limit budget is tracked here too, counting every
+    reserved request, not just the ones whose responses have come back. Once
+    it drops below RATE_LIMIT_LOW_WATER, the rest of the budget is spread
+    over what is left of the window. After a response without rate-limit
+    headers, slots fall back to REQUEST_DELAY apart.
+    """
+
+    def __init__(self, clock=time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_slot = float("-inf")
+        self._remaining: Optional[float] = None
+        self._reset_at = 0.0
+        self._has_headers = True
+
+    def wait(self) -> None:
+        """Block until this caller's send slot arrives."""
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._last_slot + self._reserve(now))
+            self._last_slot = slot
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, headers) -> None:
+        """Update the shared budget from a response's rate-limit headers.
+
+        Reddit sends ``x-ratelimit-remaining`` (requests left in the window)
+        and ``x-ratelimit-reset`` (seconds until it resets).
+        """
+        try:
+            remaining = float(headers["x-ratelimit-remaining"])
+            reset = float(headers["x-ratelimit-reset"])
+        except (KeyError, ValueError):
+            with self._lock:
+                self._has_headers = False
+            return
+
+        with self._lock:
+            now = self._clock()
+            if self._remaining is not None and now < self._reset_at:
+                # Same window: requests reserved since this one was sent are
+                # not in Reddit's count yet, so keep the lower estimate.
+                remaining = min(remaining, self._remaining)
+            self._remaining = remaining
+            self._reset_at = now + reset
+            self._has_headers = True
+
+    def _reserve(self, now: float) -> float:
+        """Take one request from the budget; return its gap after the last slot.
+
+        Must be called with the lock held.
+        """
+        if not self._has_headers:
+            return REQUEST_DELAY
+        base = max(now, self._last_slot)
+        if self._remaining is None or base >= self._reset_at:
+            # No budget known for this window until a response reports one
+            self._remaining = None
+            return MIN_REQUEST_INTERVAL
+
+        remaining = self._remaining
+        self._remaining -= 1
+        if remaining < RATE_LIMIT_LOW_WATER:
+            spread = (self._reset_at - base) / max(remaining, 1.0)
+            return max(MIN_REQUEST_INTERVAL, spread)
+        return MIN_REQUEST_INTERVAL
+
+
+# Shared by every poller in the process: Reddit's limits are per client, not
+# per RedditPoller instance.
+_pacer = _RequestPacer()
+
+
+@dataclass(slots=True)
+class _StagedContent:
+    """A fetched post or comment, before it becomes a RedditContent row.
+
+    Only items that survive deduplication are turned into ORM objects.
+    """
+    reddit_id: str
+    subreddit: str
+    content_type: ContentType
+    title: Optional[str]
+    body: str
+    author: str
+    reddit_created_at: datetime
+    # Filled in by _store_content
+    normalized_text: str = ""
+    content_hash: str = ""
 
 
 class RedditPoller:
@@ -47,11 +159,20 @@ class RedditPoller:
 
     @staticmethod
     def _create_http_client() -> httpx.Client:
-        """Create an httpx client for Reddit's public JSON endpoints."""
+        """Create an httpx client for Reddit's public JSON endpoints.
+
+        Every request goes to the same host, so HTTP/2 lets the poll workers
+        multiplex over one TLS connection instead of handshaking per worker.
+        """
         return httpx.Client(
             headers={"User-Agent": DEFAULT_USER_AGENT},
             follow_redirects=True,
             timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_POLL_WORKERS,
+                max_keepalive_connections=MAX_POLL_WORKERS,
+            ),
         )
 
     # ------------------------------------------------------------------
@@ -74,47 +195,24 @@ class RedditPoller:
         Returns:
             List of newly created RedditContent records.
         """
-        raw_items: list[dict] = []
-
         posts = self._fetch_posts(subreddit_name, limit)
-        for post in posts:
-            raw_items.append(
-                {
-                    "reddit_id": post["id"],
-                    "subreddit": subreddit_name,
-                    "content_type": ContentType.post,
-                    "title": post.get("title", ""),
-                    "body": post.get("selftext", ""),
-                    "author": post.get("author") or "[deleted]",
-                    "reddit_created_at": datetime.fromtimestamp(
-                        post["created_utc"], tz=timezone.utc
-                    ),
-                }
-            )
-
-        time.sleep(REQUEST_DELAY)
-
         comments = self._fetch_comments(subreddit_name, limit)
-        for comment in comments:
-            raw_items.append(
-                {
-                    "reddit_id": comment["id"],
-                    "subreddit": subreddit_name,
-                    "content_type": ContentType.comment,
-                    "title": None,
-                    "body": comment.get("body", ""),
-                    "author": comment.get("author") or "[deleted]",
-                    "reddit_created_at": datetime.fromtimestamp(
-                        comment["created_utc"], tz=timezone.utc
-                    ),
-                }
-            )
 
-        return self._store_content(raw_items)
+        return self._store_content(
+            self._stage_items(subreddit_name, posts, comments)
+        )
 
-    def poll_all_active(self) -> dict[str, list[RedditContent]]:
+    def poll_all_active(self, limit: int = 100) -> dict[str, list[RedditContent]]:
         """Poll every subreddit that has at least one active monitor.
 
+        Every posts and comments listing is fetched on a small thread pool,
+        since the time is spent waiting on Reddit; the shared request pacer
+        still keeps the requests themselves spaced out. Storage stays on the
+        calling thread because the database session is not thread-safe.
+
+        Args:
+            limit: Maximum number of items to fetch per endpoint.
+
         Returns:
             Dict mapping subreddit name to list of new RedditContent records.
         """
@@ -125,13 +223,32 @@ class RedditPoller:
         )
 
         results: dict[str, list[RedditContent]] = {}
-        for (name,) in active_names:
-            try:
-                new_content = self.poll_subreddit(name)
-                results[name] = new_content
-            except Exception:
-                logger.exception("Failed to poll r/%s", name)
-                results[name] = []
+        if not active_names:
+            return results
+
+        names = [name for (name,) in active_names]
+        # Two listings per subreddit
+        workers = min(2 * len(names), MAX_POLL_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            post_futures = {
+                name: executor.submit(self._fetch_posts, name, limit)
+                for name in names
+            }
+            comment_futures = {
+                name: executor.submit(self._fetch_comments, name, limit)
+                for name in names
+            }
+            for name in names:
+                try:
+                    staged = self._stage_items(
+                        name,
+                        post_futures[name].result(),
+                        comment_futures[name].result(),
+                    )
+                    results[name] = self._store_content(staged)
+                except Exception:
+                    logger.exception("Failed to poll r/%s", name)
+                    results[name] = []
 
         return results
 
@@ -139,6 +256,63 @@ class RedditPoller:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _stage_items(
+        subreddit_name: str, posts: list[dict], comments: list[dict]
+    ) -> list[_StagedContent]:
+        """Convert fetched post and comment data into staged items.
+
+        Listing entries already known to be stored are dropped here, before
+        any per-item work (timestamps, normalization, hashing) is done.
+
+        Args:
+            subreddit_name: Subreddit the listings were fetched from.
+            posts: Post data dicts from :meth:`_fetch_posts`.
+            comments: Comment data dicts from :meth:`_fetch_comments`.
+
+        Returns:
+            List of staged items ready for :meth:`_store_content`.
+        """
+        staged: list[_StagedContent] = []
+
+        for post in posts:
+            reddit_id = post["id"]
+            if is_known_stored(reddit_id):
+                continue
+            staged.append(
+                _StagedContent(
+                    reddit_id=reddit_id,
+                    subreddit=subreddit_name,
+                    content_type=ContentType.post,
+                    title=post.get("title", ""),
+                    body=post.get("selftext", ""),
+                    author=post.get("author") or "[deleted]",
+                    reddit_created_at=datetime.fromtimestamp(
+                        post["created_utc"], tz=timezone.utc
+                    ),
+                )
+            )
+
+        for comment in comments:
+            reddit_id = comment["id"]
+            if is_known_stored(reddit_id):
+                continue
+            staged.append(
+                _StagedContent(
+                    reddit_id=reddit_id,
+                    subreddit=subreddit_name,
+                    content_type=ContentType.comment,
+                    title=None,
+                    body=comment.get("body", ""),
+                    author=comment.get("author") or "[deleted]",
+                    reddit_created_at=datetime.fromtimestamp(
+                        comment["created_utc"], tz=timezone.utc
+                    ),
+                )
+            )
+
+        return staged
+
     def _fetch_posts(self, subreddit_name: str, limit: int) -> list[dict]:
         """Fetch recent posts from a subreddit via its public JSON feed.
 
@@ -150,9 +324,11 @@ class RedditPoller:
             List of post data dicts from the Reddit JSON response.
         """
         url = f"{REDDIT_BASE_URL}/r/{subreddit_name}/new.json"
+        _pacer.wait()
         resp = self.http.get(url, params={"limit": limit, "raw_json": 1})
+        _pacer.record(resp.headers)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return [child["data"] for child in data["data"]["children"]]
 
     def _fetch_comments(self, subreddit_name: str, limit: int = 100) -> list[dict]:
@@ -170,9 +346,11 @@ class RedditPoller:
             List of comment data dicts (top-level only).
         """
         url = f"{REDDIT_BASE_URL}/r/{subreddit_name}/comments.json"
+        _pacer.wait()
         resp = self.http.get(url, params={"limit": limit, "raw_json": 1})
+        _pacer.record(resp.headers)
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
 
         comments: list[dict] = []
         for child in data["data"]["children"]:
@@ -183,61 +361,78 @@ class RedditPoller:
                     comments.append(comment_data)
         return comments
 
-    def _store_content(self, raw_items: list[dict]) -> list[RedditContent]:
-        """Normalize, deduplicate, and persist raw content items.
+    def _store_content(self, staged: list[_StagedContent]) -> list[RedditContent]:
+        """Normalize, deduplicate, and persist staged content items.
+
+        Existing content is detected with one query per key (content hash and
+        reddit_id) for the whole batch rather than per item.
 
         Args:
-            raw_items: List of dicts with keys matching RedditContent columns
-                       plus raw text in 'title' and 'body'.
+            staged: Items from :meth:`_stage_items`, with raw text in
+                    ``title`` and ``body``.
 
         Returns:
             List of newly created RedditContent records.
         """
-        new_records: list[RedditContent] = []
+        candidates: list[_StagedContent] = []
         seen_hashes: set[str] = set()
 
-        for item in raw_items:
+        for item in staged:
             # Build the text to normalize: title + body for posts, body for comments
-            if item["title"]:
-                raw_text = f"{item['title']} {item['body']}"
+            if item.title:
+                raw_text = f"{item.title} {item.body}"
             else:
-                raw_text = item["body"]
+                raw_text = item.body
 
-            normalized = normalize_text(raw_text)
-            content_hash = compute_content_hash(normalized.normalized_text)
+            item.normalized_text = normalize_text(raw_text).normalized_text
+            item.content_hash = compute_content_hash(item.normalized_text)
 
             # Skip duplicates within this batch
-            if content_hash in seen_hashes:
+            if item.content_hash in seen_hashes:
                 continue
-            seen_hashes.add(content_hash)
+            seen_hashes.add(item.content_hash)
+            candidates.append(item)
 
-            if is_duplicate(self.db, content_hash):
-                continue
+        if not candidates:
+            return []
 
-            # Also skip if reddit_id already stored (safety net)
-            existing = (
-                self.db.query(RedditContent.id)
-                .filter(RedditContent.reddit_id == item["reddit_id"])
-                .first()
-            )
-            if existing:
+        existing_hashes = find_existing_hashes(self.db, seen_hashes)
+        # Also skip if reddit_id already stored (safety net)
+        existing_ids = self._find_existing_reddit_ids(
+            {item.reddit_id for item in candidates}
+        )
+        remember_stored_ids(existing_ids)
+
+        new_records: list[RedditContent] = []
+        for item in candidates:
+            if item.content_hash in existing_hashes or item.reddit_id in existing_ids:
                 continue
 
             record = RedditContent(
-                reddit_id=item["reddit_id"],
-                subreddit=item["subreddit"],
-                content_type=item["content_type"],
-                title=item["title"],
-                body=item["body"],
-                author=item["author"],
-                normalized_text=normalized.normalized_text,
-                content_hash=content_hash,
-                reddit_created_at=item["reddit_created_at"],
+                reddit_id=item.reddit_id,
+                subreddit=item.subreddit,
+                content_type=item.content_type,
+                title=item.title,
+                body=item.body,
+                author=item.author,
+                normalized_text=item.normalized_text,
+                content_hash=item.content_hash,
+                reddit_created_at=item.reddit_created_at,
             )
-            self.db.add(record)
             new_records.append(record)
 
         if new_records:
+            self.db.add_all(new_records)
             self.db.commit()
+            remember_stored_ids(record.reddit_id for record in new_records)
 
         return new_records
+
+    def _find_existing_reddit_ids(self, reddit_ids: set[str]) -> set[str]:
+        """Return the subset of *reddit_ids* already stored, in one query."""
+        rows = (
+            self.db.query(RedditContent.reddit_id)
+            .filter(RedditContent.reddit_id.in_(reddit_ids))
+            .all()
+        )
+        return {reddit_id for (reddit_id,) in rows}
@@ -27,6 +27,16 @@ logger = logging.getLogger(__name__)
 
 POLL_INTERVAL_MINUTES: int = int(os.getenv("POLL_INTERVAL_MINUTES", "60"))
 RETENTION_DAYS: int = int(os.getenv("RETENTION_DAYS", "90"))
+# Which jobs this process schedules: "all", "pipeline" or "retention".
+# Running the two as separate processes keeps a long retention sweep from
+# delaying pipeline ticks.
+WORKER_JOBS: str = os.getenv("WORKER_JOBS", "all")
+
+# Never run a job concurrently with itself, and collapse a backlog of missed
+# runs into one. APScheduler's default 1s misfire grace would silently drop a
+# run that starts late, so each job gets a grace period of its own.
+_JOB_OPTIONS: dict = {"coalesce": True, "max_instances": 1}
+RETENTION_MISFIRE_GRACE_SECONDS: int = 3600
 
 
 # ---------------------------------------------------------------------------
@@ -36,26 +46,22 @@ RETENTION_DAYS: int = int(os.getenv("RETENTION_DAYS", "90"))
 
 def pipeline_job() -> None:
     """Run the full poll/match/alert pipeline."""
-    session = SessionLocal()
-    try:
-        summary = run_pipeline(session)
-        logger.info("Pipeline job finished: %s", summary)
-    except Exception:
-        logger.exception("Pipeline job failed")
-    finally:
-        session.close()
+    with SessionLocal() as session:
+        try:
+            summary = run_pipeline(session)
+            logger.info("Pipeline job finished: %s", summary)
+        except Exception:
+            logger.exception("Pipeline job failed")
 
 
 def retention_job() -> None:
     """Run the daily data-retention cleanup."""
-    session = SessionLocal()
-    try:
-        result = cleanup_old_data(session, retention_days=RETENTION_DAYS)
-        logger.info("Retention job finished: %s", result)
-    except Exception:
-        logger.exception("Retention job failed")
-    finally:
-        session.close()
+    with SessionLocal() as session:
+        try:
+            result = cleanup_old_data(session, retention_days=RETENTION_DAYS)
+            logger.info("Retention job finished: %s", result)
+        except Exception:
+            logger.exception("Retention job failed")
 
 
 # ---------------------------------------------------------------------------
@@ -63,18 +69,19 @@ def retention_job() -> None:
 # ---------------------------------------------------------------------------
 
 
-def create_scheduler() -> BlockingScheduler:
-    """Build and configure the APScheduler BlockingScheduler."""
-    scheduler = BlockingScheduler()
-
+def _add_pipeline_job(scheduler: BlockingScheduler) -> None:
     scheduler.add_job(
         pipeline_job,
         "interval",
         minutes=POLL_INTERVAL_MINUTES,
         id="pipeline",
         name="Poll/Match/Alert pipeline",
+        misfire_grace_time=POLL_INTERVAL_MINUTES * 60,
+        **_JOB_OPTIONS,
     )
 
+
+def _add_retention_job(scheduler: BlockingScheduler) -> None:
     scheduler.add_job(
         retention_job,
         "cron",
@@ -82,11 +89,40 @@ def create_scheduler() -> BlockingScheduler:
         minute=0,
         id="retention",
         name="Data retention cleanup",
+        misfire_grace_time=RETENTION_MISFIRE_GRACE_SECONDS,
+        **_JOB_OPTIONS,
     )
 
+
+def create_pipeline_scheduler() -> BlockingScheduler:
+    """Build a scheduler that runs only the pipeline job."""
+    scheduler = BlockingScheduler()
+    _add_pipeline_job(scheduler)
+    return scheduler
+
+
+def create_retention_scheduler() -> BlockingScheduler:
+    """Build a scheduler that runs only the retention job."""
+    scheduler = BlockingScheduler()
+    _add_retention_job(scheduler)
     return scheduler
 
 
+def create_scheduler() -> BlockingScheduler:
+    """Build a scheduler that runs both the pipeline and retention jobs."""
+    scheduler = BlockingScheduler()
+    _add_pipeline_job(scheduler)
+    _add_retention_job(scheduler)
+    return scheduler
+
+
+_SCHEDULER_FACTORIES = {
+    "all": create_scheduler,
+    "pipeline": create_pipeline_scheduler,
+    "retention": create_retention_scheduler,
+}
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
@@ -98,17 +134,24 @@ def main() -> None:
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
+    if WORKER_JOBS not in _SCHEDULER_FACTORIES:
+        raise SystemExit(
+            f"Unknown WORKER_JOBS={WORKER_JOBS!r}; "
+            f"expected one of {', '.join(_SCHEDULER_FACTORIES)}"
+        )
     logger.info(
-        "Starting Reddalert worker — poll every %d min, retain %d days",
+        "Starting Reddalert worker (%s jobs) — poll every %d min, retain %d days",
+        WORKER_JOBS,
         POLL_INTERVAL_MINUTES,
         RETENTION_DAYS,
     )
 
-    scheduler = create_scheduler()
+    scheduler = _SCHEDULER_FACTORIES[WORKER_JOBS]()
 
-    # Run the pipeline once immediately on startup
-    logger.info("Running initial pipeline on startup...")
-    pipeline_job()
+    if scheduler.get_job("pipeline") is not None:
+        # Run the pipeline once immediately on startup
+        logger.info("Running initial pipeline on startup...")
+        pipeline_job()
 
     def _shutdown(signum: int, frame: Optional[object]) -> None:
         logger.info("Received signal %s — shutting down scheduler", signum)
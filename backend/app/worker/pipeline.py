@@ -6,6 +6,7 @@ Executes the full poll -> match -> alert cycle in a single call.
 """
 
 import logging
+from itertools import chain
 
 from sqlalchemy.orm import Session
 
@@ -44,9 +45,7 @@ def run_pipeline(db_session: Session) -> dict:
     poll_results = poller.poll_all_active()
     summary["subreddits_polled"] = len(poll_results)
 
-    all_new_content = []
-    for sub_name, content_list in poll_results.items():
-        all_new_content.extend(content_list)
+    all_new_content = list(chain.from_iterable(poll_results.values()))
     summary["new_content"] = len(all_new_content)
 
     logger.info(
@@ -9,6 +9,7 @@ period to keep the database lean.
 import logging
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import Table, func, select, text
 from sqlalchemy.orm import Session
 
 from app.models.content import RedditContent
@@ -16,35 +17,54 @@ from app.models.matches import Match
 
 logger = logging.getLogger(__name__)
 
+# Rows deleted per statement; each batch is committed before the next.
+RETENTION_BATCH_SIZE = 1000
 
-def cleanup_old_data(db_session: Session, retention_days: int = 90) -> dict:
+# Planner hint applied to each PostgreSQL cleanup transaction so the
+# timestamp indexes are preferred over sequential scans.
+_RANDOM_PAGE_COST_HINT = text("SET LOCAL random_page_cost = 1.1")
+
+
+def cleanup_old_data(
+    db_session: Session,
+    retention_days: int = 90,
+    batch_size: int = RETENTION_BATCH_SIZE,
+) -> dict:
     """Delete content and match records older than *retention_days*.
 
+    Rows are deleted in batches of *batch_size*, committing after each, so
+    a large backlog never holds locks on the whole expired range at once.
+
     Args:
         db_session: An active SQLAlchemy session.
         retention_days: Number of days to retain data. Records older than this
             are permanently deleted.
+        batch_size: Maximum number of rows removed per DELETE statement.
 
     Returns:
         A dict with keys: content_deleted, matches_deleted.
     """
-    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    is_postgres = db_session.get_bind().dialect.name == "postgresql"
+    # Fix the cutoff once, up front: both passes must expire the same range,
+    # and now() on PostgreSQL moves with every batch commit. The database
+    # clock is used there so the worker's own clock does not matter.
+    if is_postgres:
+        now = db_session.scalar(select(func.now()))
+    else:
+        now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=retention_days)
+
+    matches = Match.__table__
+    content = RedditContent.__table__
 
     # Delete matches first (FK references content)
-    matches_deleted = (
-        db_session.query(Match)
-        .filter(Match.detected_at < cutoff)
-        .delete(synchronize_session="fetch")
+    matches_deleted = _delete_in_batches(
+        db_session, matches, matches.c.detected_at < cutoff, batch_size, is_postgres
     )
-
-    content_deleted = (
-        db_session.query(RedditContent)
-        .filter(RedditContent.fetched_at < cutoff)
-        .delete(synchronize_session="fetch")
+    content_deleted = _delete_in_batches(
+        db_session, content, content.c.fetched_at < cutoff, batch_size, is_postgres
     )
 
-    db_session.commit()
-
     logger.info(
         "Retention cleanup: deleted %d matches and %d content items older than %d days",
         matches_deleted,
@@ -56,3 +76,36 @@ def cleanup_old_data(db_session: Session, retention_days: int = 90) -> dict:
         "content_deleted": content_deleted,
         "matches_deleted": matches_deleted,
     }
+
+
+def _delete_in_batches(
+    db_session: Session,
+    table: Table,
+    condition,
+    batch_size: int,
+    tune_planner: bool = False,
+) -> int:
+    """Delete rows of *table* matching *condition*, *batch_size* at a time.
+
+    Uses Core DELETE statements: nothing deleted here is loaded in the
+    session, so the ORM's bulk-delete bookkeeping would be pure overhead.
+    When *tune_planner* is set, the random_page_cost hint is re-issued at
+    the start of every batch, since SET LOCAL ends with each commit.
+
+    Returns:
+        Total number of rows deleted.
+    """
+    total = 0
+    while True:
+        if tune_planner:
+            db_session.execute(_RANDOM_PAGE_COST_HINT)
+        batch_ids = select(table.c.id).where(condition).limit(batch_size)
+        deleted = db_session.execute(
+            table.delete().where(table.c.id.in_(batch_ids.scalar_subquery()))
+        ).rowcount
+        if deleted:
+            db_session.commit()
+            total += deleted
+        # A short batch means nothing is left; skip the empty round trip
+        if deleted < batch_size:
+            return total
@@ -3,14 +3,19 @@ from __future__ import annotations
 """Shared test configuration.
 
 Registers a SQLite-compatible ARRAY type so tests can use SQLite
-in-memory databases with models that use PostgreSQL ARRAY columns.
+in-memory databases with models that use PostgreSQL ARRAY columns, and
+provides a ``db_session`` fixture backed by such a database.
 """
 
 import json
 
-from sqlalchemy import String, TypeDecorator, event
+import pytest
+from sqlalchemy import String, TypeDecorator, create_engine, event
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models import Base
 
 
 class _StringifiedARRAY(TypeDecorator):
@@ -64,3 +69,23 @@ def _patched_result_processor(self, dialect, coltype):
 
 ARRAY.bind_processor = _patched_bind_processor
 ARRAY.result_processor = _patched_result_processor
+
+
+@pytest.fixture
+def db_session():
+    """A session on a fresh in-memory SQLite database with every table."""
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
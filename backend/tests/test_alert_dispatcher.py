@@ -111,6 +111,28 @@ class TestSingleMatchAlert:
         assert match.alert_sent_at is not None
         mock_send.assert_called_once()
 
+    @patch("app.services.alert_dispatcher.AlertDispatcher._send_webhook", return_value=True)
+    def test_status_updates_written_in_one_commit(self, mock_send):
+        client_id = uuid.uuid4()
+        base = datetime.now(timezone.utc)
+        # Spread outside the batch window so each match is sent individually
+        matches = [
+            _make_match(
+                client_id=client_id,
+                detected_at=base + timedelta(seconds=i * (BATCH_WINDOW_SECONDS + 1)),
+            )
+            for i in range(5)
+        ]
+        session = _mock_session(pending_matches=matches, webhook=_make_webhook(client_id))
+        dispatcher = AlertDispatcher(session)
+
+        result = dispatcher.dispatch_pending()
+
+        assert result["sent"] == 5
+        assert mock_send.call_count == 5
+        session.commit.assert_called_once()
+        session.flush.assert_not_called()
+
     @patch("app.services.alert_dispatcher.AlertDispatcher._send_webhook", return_value=True)
     def test_no_pending_matches(self, mock_send):
         session = _mock_session(pending_matches=[])
@@ -0,0 +1,29 @@
+"""Tests for the engine configuration in app.database."""
+
+from sqlalchemy.pool import StaticPool
+
+from app.database import _build_engine_kwargs
+
+
+class TestBuildEngineKwargs:
+    """Tests for _build_engine_kwargs()."""
+
+    def test_psycopg2_batches_executemany(self):
+        kwargs = _build_engine_kwargs("postgresql+psycopg2://u:p@localhost/reddalert")
+        assert kwargs == {"pool_pre_ping": True, "executemany_mode": "values_plus_batch"}
+
+    def test_default_postgresql_driver_is_psycopg2(self):
+        kwargs = _build_engine_kwargs("postgresql://u:p@localhost/reddalert")
+        assert kwargs["executemany_mode"] == "values_plus_batch"
+
+    def test_other_postgresql_driver_skips_executemany_mode(self):
+        kwargs = _build_engine_kwargs("postgresql+asyncpg://u:p@localhost/reddalert")
+        assert kwargs == {"pool_pre_ping": True}
+
+    def test_sqlite(self):
+        kwargs = _build_engine_kwargs("sqlite:///./reddalert.db")
+        assert kwargs == {"connect_args": {"check_same_thread": False}}
+
+    def test_sqlite_static_pool(self):
+        kwargs = _build_engine_kwargs("sqlite://", static_pool=True)
+        assert kwargs["poolclass"] is StaticPool
@@ -3,12 +3,19 @@
 import hashlib
 import uuid
 from datetime import datetime, timezone
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from app.models.content import ContentType, RedditContent
-from app.services.deduplicator import compute_content_hash, is_duplicate, mark_deleted
+from app.services.deduplicator import (
+    clear_known_stored,
+    compute_content_hash,
+    is_duplicate,
+    is_known_stored,
+    mark_deleted,
+    remember_stored_ids,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -17,10 +24,10 @@ from app.services.deduplicator import compute_content_hash, is_duplicate, mark_d
 
 
 class TestComputeContentHash:
-    def test_returns_sha256_hex(self):
+    def test_returns_blake2b_128_hex(self):
         text = "hello world"
         result = compute_content_hash(text)
-        expected = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        expected = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
         assert result == expected
 
     def test_deterministic(self):
@@ -32,14 +39,14 @@ class TestComputeContentHash:
 
     def test_empty_string(self):
         result = compute_content_hash("")
-        expected = hashlib.sha256(b"").hexdigest()
+        expected = hashlib.blake2b(b"", digest_size=16).hexdigest()
         assert result == expected
 
     def test_unicode_text(self):
         text = "arbitrage betting discussion"
         result = compute_content_hash(text)
         assert isinstance(result, str)
-        assert len(result) == 64  # SHA-256 hex length
+        assert len(result) == 32  # 16-byte digest, hex-encoded
 
 
 # ---------------------------------------------------------------------------
@@ -93,3 +100,33 @@ class TestMarkDeleted:
 
         assert result is False
         session.commit.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Known stored-id cache
+# ---------------------------------------------------------------------------
+
+
+class TestKnownStoredIds:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        clear_known_stored()
+        yield
+        clear_known_stored()
+
+    def test_unknown_by_default(self):
+        assert is_known_stored("abc") is False
+
+    def test_remembered_ids_are_known(self):
+        remember_stored_ids(["abc", "def"])
+        assert is_known_stored("abc")
+        assert is_known_stored("def")
+
+    def test_evicts_least_recently_remembered(self):
+        with patch("app.services.deduplicator.KNOWN_ID_CACHE_SIZE", 2):
+            remember_stored_ids(["a", "b"])
+            remember_stored_ids(["a"])  # refresh "a"
+            remember_stored_ids(["c"])
+        assert is_known_stored("a")
+        assert not is_known_stored("b")
+        assert is_known_stored("c")
@@ -156,13 +156,11 @@ def _mock_session_for_match_engine(monitored_subs=None, keywords=None):
             q.filter.return_value.all.return_value = monitored_subs or []
         elif model is Keyword:
             q.filter.return_value.all.return_value = keywords or []
-        else:
-            # Match.id duplicate check -> no existing match
-            q.filter.return_value.first.return_value = None
-            q.filter.return_value.all.return_value = []
         return q
 
     session.query.side_effect = query_side_effect
+    # Existing-match lookup -> no stored matches
+    session.execute.return_value.tuples.return_value = []
     return session
 
 
@@ -101,13 +101,11 @@ def _mock_session(monitored_subs=None, keywords=None):
             q.filter.return_value.all.return_value = monitored_subs or []
         elif model is Keyword:
             q.filter.return_value.all.return_value = keywords or []
-        else:
-            # Match.id queries for duplicate check — return None (no existing match)
-            q.filter.return_value.first.return_value = None
-            q.filter.return_value.all.return_value = []
         return q
 
     session.query.side_effect = query_side_effect
+    # Existing-match lookup — no stored matches unless a test sets some
+    session.execute.return_value.tuples.return_value = []
     return session
 
 
@@ -136,7 +134,7 @@ class TestProcessContent:
         assert m.content_id == content.id
         assert m.matched_phrase == "arbitrage betting"
         assert m.alert_status == AlertStatus.pending
-        session.add.assert_called()
+        session.add_all.assert_called_once_with(matches)
         session.commit.assert_called_once()
 
     def test_no_match_returns_empty(self):
@@ -151,6 +149,7 @@ class TestProcessContent:
         matches = engine.process_content(content)
 
         assert matches == []
+        session.add_all.assert_not_called()
         session.commit.assert_not_called()
 
 
@@ -182,9 +181,6 @@ class TestMultiClientFanOut:
                 else:
                     q.filter.return_value.all.return_value = [kw_b]
                 call_count["kw"] += 1
-            else:
-                # Match.id queries for duplicate check — no existing match
-                q.filter.return_value.first.return_value = None
             return q
 
         session = MagicMock()
@@ -197,6 +193,52 @@ class TestMultiClientFanOut:
         client_ids = {m.client_id for m in matches}
         assert client_a.id in client_ids
         assert client_b.id in client_ids
+        # All matches for the content are added to the session together
+        session.add.assert_not_called()
+        session.add_all.assert_called_once_with(matches)
+
+
+class TestExistingMatches:
+    """Matches already stored for a content item are not recreated."""
+
+    def test_existing_match_skipped(self):
+        client = _make_client()
+        keyword = _make_keyword(client, phrases=["arbitrage betting"])
+        sub = _make_monitored_sub(client)
+        content = _make_content("I love arbitrage betting strategies")
+
+        session = _mock_session(monitored_subs=[sub], keywords=[keyword])
+        session.execute.return_value.tuples.return_value = [
+            (client.id, keyword.id, content.id),
+        ]
+        engine = MatchEngine(session)
+
+        matches = engine.process_content(content)
+
+        assert matches == []
+        session.commit.assert_not_called()
+
+    def test_batch_fetches_existing_matches_once(self):
+        client = _make_client()
+        keyword = _make_keyword(client, phrases=["arbitrage betting"])
+        sub = _make_monitored_sub(client)
+        contents = [
+            _make_content(f"post {i} about arbitrage betting") for i in range(20)
+        ]
+        # The first content already has its match stored
+        session = _mock_session(monitored_subs=[sub], keywords=[keyword])
+        session.execute.return_value.tuples.return_value = [
+            (client.id, keyword.id, contents[0].id),
+        ]
+        engine = MatchEngine(session)
+
+        matches = engine.process_batch(contents)
+
+        assert len(matches) == 19
+        session.execute.assert_called_once()
+        sql = str(session.execute.call_args.args[0])
+        assert "FROM matches" in sql
+        assert "IN" in sql
 
 
 class TestMultiKeywordMatches:
@@ -285,3 +327,29 @@ class TestProcessBatch:
 
         # content1 and content2 should match, content3 should not
         assert len(matches) == 2
+
+    def test_batch_loads_keywords_once_per_subreddit(self):
+        client = _make_client()
+        keyword = _make_keyword(client, phrases=["arbitrage betting"])
+        sub = _make_monitored_sub(client)
+
+        contents = [
+            _make_content("I love arbitrage betting strategies"),
+            _make_content("Another post about arbitrage betting"),
+            _make_content("No keywords here"),
+            _make_content("arbitrage betting elsewhere", subreddit="sportsbetting"),
+        ]
+
+        session = _mock_session(monitored_subs=[sub], keywords=[keyword])
+        engine = MatchEngine(session)
+
+        with patch.object(
+            MatchEngine, "_keyword_to_config", wraps=MatchEngine._keyword_to_config
+        ) as mock_config:
+            matches = engine.process_batch(contents)
+
+        assert len(matches) == 3
+        queried = [c.args[0] for c in session.query.call_args_list]
+        assert sum(model is MonitoredSubreddit for model in queried) == 2
+        assert sum(model is Keyword for model in queried) == 2
+        assert mock_config.call_count == 2
@@ -1,13 +1,17 @@
 """Tests for the proximity matcher module."""
 
+import dataclasses
+import functools
+
 import pytest
 
 from app.services.normalizer import normalize_text, NormalizedResult
 from app.services.matcher import find_matches, KeywordConfig, MatchResult
 
 
+@functools.lru_cache(maxsize=None)
 def _make_content(text: str) -> NormalizedResult:
-    """Helper to normalize text for matcher tests."""
+    """Helper to normalize text for matcher tests (memoized; many tests reuse inputs)."""
     return normalize_text(text)
 
 
@@ -266,6 +270,17 @@ class TestStemming:
         results = find_matches(content, keyword)
         assert len(results) == 0
 
+    def test_config_precomputes_stemmed_terms(self):
+        keyword = KeywordConfig(
+            phrases=[["Betting", "Tools"]],
+            exclusions=["Scams"],
+            use_stemming=True,
+        )
+        assert keyword._phrase_tokens == [["bet", "tool"]]
+        assert keyword._phrase_labels == ["Betting Tools"]
+        assert keyword._anywhere_exclusions == frozenset({"scam"})
+        assert keyword._proximity_exclusions == frozenset()
+
 
 class TestSnippetGeneration:
     """Test snippet generation around matches."""
@@ -411,6 +426,11 @@ class TestKeywordConfigDataclass:
         assert kw.use_stemming is False
         assert kw.exclusion_scope == "anywhere"
 
+    def test_frozen_after_construction(self):
+        kw = KeywordConfig(phrases=[["test"]])
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            kw.phrases = [["other"]]
+
 
 class TestRealisticScenarios:
     """Test with realistic Reddit-like content and keyword configs."""
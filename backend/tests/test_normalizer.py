@@ -1,5 +1,7 @@
 """Tests for the text normalizer module."""
 
+from unittest.mock import patch
+
 import pytest
 
 from app.services.normalizer import normalize_text, NormalizedResult
@@ -60,6 +62,14 @@ class TestURLStripping:
         assert "example.com" not in result.normalized_text
         assert "ok" in result.normalized_text
 
+    def test_url_with_markup_characters(self):
+        result = normalize_text("see https://example.com/~alice/betting-tools for more")
+        assert result.normalized_text == "see for more"
+
+    def test_url_with_emphasis_characters(self):
+        result = normalize_text("link https://x.com/a*b^c here")
+        assert result.normalized_text == "link here"
+
 
 class TestMarkdownRemoval:
     """Test Reddit markdown formatting removal."""
@@ -108,6 +118,28 @@ class TestMarkdownRemoval:
         assert "**" not in result.normalized_text
         assert "*" not in result.normalized_text
 
+    def test_plain_text_skips_stripping(self):
+        with patch("app.services.normalizer._strip_markdown") as mock_strip:
+            result = normalize_text("Just plain prose, nothing to strip here.")
+        mock_strip.assert_not_called()
+        assert result.normalized_text == "just plain prose, nothing to strip here."
+
+    def test_horizontal_rule_still_stripped(self):
+        result = normalize_text("above\n---\nbelow")
+        assert result.normalized_text == "above below"
+
+    def test_asterisk_horizontal_rule_stripped(self):
+        result = normalize_text("above\n***\nbelow")
+        assert result.normalized_text == "above below"
+
+    def test_nested_inline_markup(self):
+        result = normalize_text("***very*** ~~`old`~~ news^2")
+        assert result.normalized_text == "very old news 2"
+
+    def test_unpaired_operators_still_split_tokens(self):
+        result = normalize_text("a*b and 2^10")
+        assert result.tokens == ["a", "b", "and", "2", "10"]
+
 
 class TestWhitespaceNormalization:
     """Test whitespace handling."""
@@ -168,6 +200,12 @@ class TestTokenization:
         assert "python3" in result.tokens or "python" in result.tokens
         assert "node" in result.tokens
 
+    def test_char_offsets_point_at_tokens(self):
+        result = normalize_text("hello, world!  how are you?")
+        assert len(result.char_offsets) == len(result.tokens)
+        for token, offset in zip(result.tokens, result.char_offsets):
+            assert result.normalized_text[offset:offset + len(token)] == token
+
 
 class TestSentenceSegmentation:
     """Test sentence splitting."""
@@ -203,10 +241,16 @@ class TestNormalizedResultDataclass:
         result = normalize_text("test")
         assert isinstance(result, NormalizedResult)
 
+    def test_sentences_segmented_lazily(self):
+        result = normalize_text("First one. Second one.")
+        assert result._sentences is None
+        assert result.sentences == ["first one.", "second one."]
+        assert result._sentences is result.sentences
+
     def test_default_factory(self):
         result = NormalizedResult(normalized_text="test")
         assert result.tokens == []
-        assert result.sentences == []
+        assert result.sentences == ["test"]
 
 
 class TestRealisticRedditContent:
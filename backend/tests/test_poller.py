@@ -1,16 +1,52 @@
 """Tests for the Reddit poller service."""
 
-import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import List, Optional
 from unittest.mock import MagicMock, patch, call
 
 import httpx
+import orjson
 import pytest
 
 from app.models.content import ContentType, RedditContent
 from app.models.subreddits import MonitoredSubreddit, SubredditStatus
-from app.services.poller import RedditPoller
+from app.services.deduplicator import (
+    clear_known_stored,
+    compute_content_hash,
+    is_known_stored,
+    remember_stored_ids,
+)
+from app.services.normalizer import normalize_text
+from app.services import poller as poller_module
+from app.services.poller import (
+    DEFAULT_USER_AGENT,
+    MAX_POLL_WORKERS,
+    MIN_REQUEST_INTERVAL,
+    REDDIT_BASE_URL,
+    REQUEST_DELAY,
+    RedditPoller,
+    _RequestPacer,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_known_ids():
+    """Keep the process-wide stored-id cache from leaking between tests."""
+    clear_known_stored()
+    yield
+    clear_known_stored()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pacer(monkeypatch):
+    """Give each test its own request pacer on a clock frozen at zero.
+
+    With the clock frozen, each reserved slot's sleep is exactly its offset
+    from the first request, which keeps pacing assertions deterministic.
+    """
+    monkeypatch.setattr(poller_module, "_pacer", _RequestPacer(clock=lambda: 0.0))
 
 
 # ---------------------------------------------------------------------------
@@ -78,16 +114,15 @@ def _make_db_session(existing_hashes=None, existing_reddit_ids=None):
 
         def filter_side_effect(condition):
             mock_filtered = MagicMock()
-            # Inspect the binary expression to decide the return value
-            try:
-                right_val = condition.right.effective_value
-            except AttributeError:
-                right_val = None
-
-            if right_val in existing_hashes or right_val in existing_reddit_ids:
-                mock_filtered.first.return_value = (uuid.uuid4(),)
-            else:
-                mock_filtered.first.return_value = None
+            # Inspect the IN expression to decide which stored values match
+            existing = {
+                "content_hash": existing_hashes,
+                "reddit_id": existing_reddit_ids,
+            }.get(condition.left.key, set())
+            requested = condition.right.effective_value or []
+            mock_filtered.all.return_value = [
+                (value,) for value in requested if value in existing
+            ]
             return mock_filtered
 
         mock_query.filter.side_effect = filter_side_effect
@@ -97,13 +132,16 @@ def _make_db_session(existing_hashes=None, existing_reddit_ids=None):
     return session
 
 
-def _make_http_client(posts_response=None, comments_response=None):
+def _make_http_client(posts_response=None, comments_response=None, headers=None):
     """Create a mock httpx.Client that returns canned JSON for posts & comments.
 
     Args:
         posts_response: Listing dict returned for ``/new.json``.
         comments_response: Listing dict returned for ``/comments.json``.
+        headers: Response headers; defaults to a healthy rate-limit budget.
     """
+    if headers is None:
+        headers = {"x-ratelimit-remaining": "95.0", "x-ratelimit-reset": "300"}
     if posts_response is None:
         posts_response = _make_listing([])
     if comments_response is None:
@@ -114,12 +152,13 @@ def _make_http_client(posts_response=None, comments_response=None):
     def get_side_effect(url, **kwargs):
         mock_resp = MagicMock()
         mock_resp.raise_for_status = MagicMock()
+        mock_resp.headers = headers
         if "/new.json" in url:
-            mock_resp.json.return_value = posts_response
+            mock_resp.content = orjson.dumps(posts_response)
         elif "/comments.json" in url:
-            mock_resp.json.return_value = comments_response
+            mock_resp.content = orjson.dumps(comments_response)
         else:
-            mock_resp.json.return_value = _make_listing([])
+            mock_resp.content = orjson.dumps(_make_listing([]))
         return mock_resp
 
     client.get.side_effect = get_side_effect
@@ -147,6 +186,23 @@ class TestRedditPollerInit:
             mock_create.assert_called_once()
             assert poller.http is mock_create.return_value
 
+    def test_default_http_client_is_usable(self):
+        client = RedditPoller._create_http_client()
+        try:
+            assert client.headers["User-Agent"] == DEFAULT_USER_AGENT
+        finally:
+            client.close()
+
+    def test_default_http_client_uses_http2_sized_to_workers(self):
+        with patch("app.services.poller.httpx.Client") as mock_client:
+            RedditPoller._create_http_client()
+        kwargs = mock_client.call_args.kwargs
+        assert kwargs["http2"] is True
+        assert kwargs["limits"] == httpx.Limits(
+            max_connections=MAX_POLL_WORKERS,
+            max_keepalive_connections=MAX_POLL_WORKERS,
+        )
+
 
 class TestFetchPosts:
     def test_calls_correct_url(self):
@@ -207,7 +263,8 @@ class TestPollSubreddit:
         result = poller.poll_subreddit("sportsbook", limit=10)
 
         # Should have added records and committed
-        assert db.add.call_count == 2  # 1 post + 1 comment
+        db.add_all.assert_called_once()
+        assert len(db.add_all.call_args.args[0]) == 2  # 1 post + 1 comment
         db.commit.assert_called_once()
         assert len(result) == 2
 
@@ -224,6 +281,57 @@ class TestPollSubreddit:
         assert len(result) == 0
         db.commit.assert_not_called()
 
+    @patch("app.services.poller.time.sleep")
+    def test_skips_existing_hashes(self, mock_sleep):
+        post = _make_post_data(post_id="new1", selftext="already seen")
+        http = _make_http_client(posts_response=_make_listing([post]))
+        stored_hash = compute_content_hash(
+            normalize_text("Test Post already seen").normalized_text
+        )
+        db = _make_db_session(existing_hashes={stored_hash})
+        poller = RedditPoller(db, http)
+
+        result = poller.poll_subreddit("test")
+
+        assert len(result) == 0
+        # One IN query per key for the whole batch
+        assert db.query.call_count == 2
+
+    @patch("app.services.poller.time.sleep")
+    def test_remembers_stored_ids_across_polls(self, mock_sleep):
+        post = _make_post_data(post_id="p1", selftext="fresh content")
+        http = _make_http_client(posts_response=_make_listing([post]))
+        db = _make_db_session()
+        poller = RedditPoller(db, http)
+
+        assert len(poller.poll_subreddit("test")) == 1
+        assert is_known_stored("p1")
+
+        # Second poll sees the same listing: nothing to check or store
+        db.query.reset_mock()
+        assert poller.poll_subreddit("test") == []
+        db.query.assert_not_called()
+
+    def test_staging_drops_known_ids_before_parsing(self):
+        remember_stored_ids(["seen"])
+        # A known entry is skipped before its fields (even created_utc) are read
+        posts = [{"id": "seen"}, _make_post_data(post_id="new")]
+
+        staged = RedditPoller._stage_items("test", posts, [])
+
+        assert [item.reddit_id for item in staged] == ["new"]
+
+    @patch("app.services.poller.time.sleep")
+    def test_remembers_ids_found_in_db(self, mock_sleep):
+        post = _make_post_data(post_id="dup1", selftext="duplicate content")
+        http = _make_http_client(posts_response=_make_listing([post]))
+        db = _make_db_session(existing_reddit_ids={"dup1"})
+        poller = RedditPoller(db, http)
+
+        poller.poll_subreddit("test")
+
+        assert is_known_stored("dup1")
+
     @patch("app.services.poller.time.sleep")
     def test_handles_empty_subreddit(self, mock_sleep):
         http = _make_http_client()
@@ -268,14 +376,116 @@ class TestPollSubreddit:
         assert result[0].author == "[deleted]"
 
     @patch("app.services.poller.time.sleep")
-    def test_sleeps_between_posts_and_comments_requests(self, mock_sleep):
+    def test_only_minimum_gap_with_rate_budget_available(self, mock_sleep):
         http = _make_http_client()
         db = _make_db_session()
         poller = RedditPoller(db, http)
         poller.poll_subreddit("test")
-        mock_sleep.assert_called_once()
+        # The comments request waits out the gap after the posts request
+        assert mock_sleep.call_args_list == [call(MIN_REQUEST_INTERVAL)]
+
+    @patch("app.services.poller.time.sleep")
+    def test_sleeps_when_rate_budget_low(self, mock_sleep):
+        http = _make_http_client(
+            headers={"x-ratelimit-remaining": "2.0", "x-ratelimit-reset": "60"}
+        )
+        db = _make_db_session()
+        poller = RedditPoller(db, http)
+        poller.poll_subreddit("test")
+        # Two requests left in a 60s window: the comments request is spread
+        assert mock_sleep.call_args_list == [call(30.0)]
+
+    @patch("app.services.poller.time.sleep")
+    def test_sleeps_fixed_delay_without_rate_headers(self, mock_sleep):
+        http = _make_http_client(headers={})
+        db = _make_db_session()
+        poller = RedditPoller(db, http)
+        poller.poll_subreddit("test")
+        assert mock_sleep.call_args_list == [call(REQUEST_DELAY)]
+
+
+class TestRequestPacer:
+    def test_concurrent_callers_get_distinct_slots(self):
+        pacer = _RequestPacer(clock=lambda: 0.0)
+        barrier = threading.Barrier(MAX_POLL_WORKERS, timeout=5)
+
+        def request():
+            barrier.wait()
+            pacer.wait()
+
+        with patch("app.services.poller.time.sleep") as mock_sleep:
+            threads = [threading.Thread(target=request) for _ in range(MAX_POLL_WORKERS)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        waits = sorted(c.args[0] for c in mock_sleep.call_args_list)
+        assert waits == [
+            MIN_REQUEST_INTERVAL * k for k in range(1, MAX_POLL_WORKERS)
+        ]
+
+    def test_concurrent_callers_share_the_rate_budget(self):
+        pacer = _RequestPacer(clock=lambda: 0.0)
+        pacer.record({"x-ratelimit-remaining": "3", "x-ratelimit-reset": "30"})
+        barrier = threading.Barrier(MAX_POLL_WORKERS, timeout=5)
+
+        def request():
+            barrier.wait()
+            pacer.wait()
+
+        with patch("app.services.poller.time.sleep") as mock_sleep:
+            threads = [threading.Thread(target=request) for _ in range(MAX_POLL_WORKERS)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        # The three remaining requests are spread over the window (one at 0s,
+        # no sleep); the rest wait for the reset instead of overshooting.
+        waits = sorted(c.args[0] for c in mock_sleep.call_args_list)
+        assert waits == [15.0, 30.0, 30.5, 31.0, 31.5, 32.0, 32.5]
 
+    def test_in_flight_requests_count_against_reported_budget(self):
+        pacer = _RequestPacer(clock=lambda: 0.0)
+        pacer.record({"x-ratelimit-remaining": "10", "x-ratelimit-reset": "62.5"})
+        with patch("app.services.poller.time.sleep"):
+            for _ in range(6):
+                pacer.wait()
+        # A late response from before those requests must not raise the estimate
+        pacer.record({"x-ratelimit-remaining": "9", "x-ratelimit-reset": "62.5"})
 
+        with patch("app.services.poller.time.sleep") as mock_sleep:
+            pacer.wait()
+
+        # Four left after the 2.5s slot: spread over the remaining 60s
+        assert mock_sleep.call_args_list == [call(17.5)]
+
+    def test_budget_forgotten_after_window_resets(self):
+        now = [0.0]
+        pacer = _RequestPacer(clock=lambda: now[0])
+        pacer.record({"x-ratelimit-remaining": "1", "x-ratelimit-reset": "10"})
+        now[0] = 11.0
+
+        with patch("app.services.poller.time.sleep") as mock_sleep:
+            pacer.wait()
+            pacer.wait()
+
+        assert mock_sleep.call_args_list == [call(MIN_REQUEST_INTERVAL)]
+
+    def test_no_wait_once_gap_has_passed(self):
+        now = [0.0]
+        pacer = _RequestPacer(clock=lambda: now[0])
+
+        with patch("app.services.poller.time.sleep") as mock_sleep:
+            pacer.wait()
+            now[0] = MIN_REQUEST_INTERVAL + 0.1
+            pacer.wait()
+
+        mock_sleep.assert_not_called()
+
+
+@patch("app.services.poller.time.sleep", new=MagicMock())
 class TestPollAllActive:
     def test_polls_each_active_subreddit(self):
         db = MagicMock()
@@ -286,13 +496,58 @@ class TestPollAllActive:
         http = _make_http_client()
         poller = RedditPoller(db, http)
 
-        with patch.object(poller, "poll_subreddit", return_value=[]) as mock_poll:
+        with patch.object(poller, "_store_content", return_value=[]) as mock_store:
+            results = poller.poll_all_active()
+            urls = [c.args[0] for c in http.get.call_args_list]
+            assert len(urls) == 4
+            assert f"{REDDIT_BASE_URL}/r/sub_a/new.json" in urls
+            assert f"{REDDIT_BASE_URL}/r/sub_b/comments.json" in urls
+            assert mock_store.call_count == 2
+            assert list(results) == ["sub_a", "sub_b"]
+
+    def test_fetches_subreddits_concurrently(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            ("sub_a",),
+            ("sub_b",),
+        ]
+        http = _make_http_client()
+        poller = RedditPoller(db, http)
+        # Each fetch waits for the other to start; a serial loop would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(name, limit):
+            barrier.wait()
+            return []
+
+        with patch.object(poller, "_fetch_posts", side_effect=fetch):
+            results = poller.poll_all_active()
+
+        assert results == {"sub_a": [], "sub_b": []}
+
+    def test_fans_out_on_bounded_thread_pool(self):
+        names = [f"sub_{i}" for i in range(10)]
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            (name,) for name in names
+        ]
+        http = _make_http_client()
+        poller = RedditPoller(db, http)
+        pools = []
+
+        def make_pool(max_workers):
+            pools.append(max_workers)
+            return ThreadPoolExecutor(max_workers=max_workers)
+
+        with patch(
+            "app.services.poller.ThreadPoolExecutor", side_effect=make_pool
+        ), patch.object(poller, "_store_content", return_value=[]) as mock_store:
             results = poller.poll_all_active()
-            assert mock_poll.call_count == 2
-            mock_poll.assert_any_call("sub_a")
-            mock_poll.assert_any_call("sub_b")
-            assert "sub_a" in results
-            assert "sub_b" in results
+
+        assert pools == [MAX_POLL_WORKERS]
+        assert http.get.call_count == 20
+        assert mock_store.call_count == 10
+        assert list(results) == names
 
     def test_handles_poll_failure_gracefully(self):
         db = MagicMock()
@@ -301,18 +556,54 @@ class TestPollAllActive:
         poller = RedditPoller(db, http)
 
         with patch.object(
-            poller, "poll_subreddit", side_effect=Exception("API error")
+            poller, "_fetch_posts", side_effect=Exception("API error")
         ):
             results = poller.poll_all_active()
             assert results["bad_sub"] == []
 
+    def test_storage_failure_does_not_stop_other_subreddits(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            ("bad_sub",),
+            ("good_sub",),
+        ]
+        http = _make_http_client()
+        poller = RedditPoller(db, http)
+        record = MagicMock(spec=RedditContent)
+
+        with patch.object(
+            poller, "_store_content", side_effect=[Exception("DB error"), [record]]
+        ):
+            results = poller.poll_all_active()
+
+        assert results == {"bad_sub": [], "good_sub": [record]}
+
     def test_no_active_subreddits(self):
         db = MagicMock()
         db.query.return_value.filter.return_value.all.return_value = []
         http = _make_http_client()
         poller = RedditPoller(db, http)
 
-        with patch.object(poller, "poll_subreddit") as mock_poll:
+        with patch.object(poller, "_fetch_posts") as mock_fetch:
             results = poller.poll_all_active()
-            mock_poll.assert_not_called()
+            mock_fetch.assert_not_called()
             assert results == {}
+
+    def test_requests_keep_minimum_gap_across_threads(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [
+            ("sub_a",),
+            ("sub_b",),
+            ("sub_c",),
+        ]
+        http = _make_http_client()
+        poller = RedditPoller(db, http)
+
+        with patch("app.services.poller.time.sleep") as mock_sleep, patch.object(
+            poller, "_store_content", return_value=[]
+        ):
+            poller.poll_all_active()
+
+        # Six requests from the pool, each in its own slot after the first
+        waits = sorted(c.args[0] for c in mock_sleep.call_args_list)
+        assert waits == [MIN_REQUEST_INTERVAL * k for k in range(1, 6)]
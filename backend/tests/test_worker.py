@@ -7,8 +7,16 @@ from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, call, patch
 
 import pytest
-
-from app.worker.main import create_scheduler, pipeline_job, retention_job
+from sqlalchemy.dialects import postgresql
+
+from app.models import Client, ContentType, Keyword, Match, RedditContent
+from app.worker.main import (
+    create_pipeline_scheduler,
+    create_retention_scheduler,
+    create_scheduler,
+    pipeline_job,
+    retention_job,
+)
 from app.worker.pipeline import run_pipeline
 from app.worker.retention import cleanup_old_data
 
@@ -32,6 +40,31 @@ def _make_match(**kwargs) -> MagicMock:
     return m
 
 
+# What the mocked database reports for now()
+_DB_NOW = datetime(2026, 1, 31, 12, 0, tzinfo=timezone.utc)
+
+
+def _make_retention_db(match_rows=(), content_rows=(), dialect="sqlite"):
+    """Return a mock session for cleanup_old_data and the statements it runs.
+
+    Successive DELETEs on each table report the given rowcounts, then 0.
+    """
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = dialect
+    db.scalar.return_value = _DB_NOW
+    rowcounts = {"matches": list(match_rows), "reddit_content": list(content_rows)}
+    executed = []
+
+    def execute(stmt):
+        executed.append(stmt)
+        table = getattr(stmt, "table", None)
+        counts = rowcounts.get(table.name) if table is not None else None
+        return MagicMock(rowcount=counts.pop(0) if counts else 0)
+
+    db.execute.side_effect = execute
+    return db, executed
+
+
 # ---------------------------------------------------------------------------
 # Pipeline tests
 # ---------------------------------------------------------------------------
@@ -40,13 +73,25 @@ def _make_match(**kwargs) -> MagicMock:
 class TestRunPipeline:
     """Tests for run_pipeline()."""
 
-    @patch("app.worker.pipeline.AlertDispatcher")
-    @patch("app.worker.pipeline.MatchEngine")
-    @patch("app.worker.pipeline.RedditPoller")
-    def test_full_pipeline_calls_services_in_order(
-        self, mock_poller_cls, mock_engine_cls, mock_dispatcher_cls
-    ):
+    @pytest.fixture
+    def pipeline_services(self):
+        """Patch the three pipeline services; yields their mocked classes.
+
+        The dispatcher reports no alerts unless a test overrides it.
+        """
+        with patch("app.worker.pipeline.RedditPoller") as poller_cls, patch(
+            "app.worker.pipeline.MatchEngine"
+        ) as engine_cls, patch("app.worker.pipeline.AlertDispatcher") as dispatcher_cls:
+            dispatcher_cls.return_value.dispatch_pending.return_value = {
+                "sent": 0,
+                "failed": 0,
+                "total": 0,
+            }
+            yield poller_cls, engine_cls, dispatcher_cls
+
+    def test_full_pipeline_calls_services_in_order(self, pipeline_services):
         """Pipeline calls poll -> match -> alert in that order."""
+        mock_poller_cls, mock_engine_cls, mock_dispatcher_cls = pipeline_services
         db = MagicMock()
 
         # Setup poller
@@ -92,38 +137,44 @@ class TestRunPipeline:
         assert summary["alerts_sent"] == 2
         assert summary["alerts_failed"] == 0
 
-    @patch("app.worker.pipeline.AlertDispatcher")
-    @patch("app.worker.pipeline.MatchEngine")
-    @patch("app.worker.pipeline.RedditPoller")
-    def test_pipeline_no_new_content_skips_matching(
-        self, mock_poller_cls, mock_engine_cls, mock_dispatcher_cls
-    ):
+    def test_pipeline_no_new_content_skips_matching(self, pipeline_services):
         """When poller returns no new content, match engine is not called."""
+        mock_poller_cls, mock_engine_cls, _ = pipeline_services
         db = MagicMock()
 
         mock_poller = mock_poller_cls.return_value
         mock_poller.poll_all_active.return_value = {"python": []}
 
-        mock_dispatcher = mock_dispatcher_cls.return_value
-        mock_dispatcher.dispatch_pending.return_value = {
-            "sent": 0,
-            "failed": 0,
-            "total": 0,
-        }
-
         summary = run_pipeline(db)
 
         mock_engine_cls.return_value.process_batch.assert_not_called()
         assert summary["new_content"] == 0
         assert summary["matches_found"] == 0
 
-    @patch("app.worker.pipeline.AlertDispatcher")
-    @patch("app.worker.pipeline.MatchEngine")
-    @patch("app.worker.pipeline.RedditPoller")
-    def test_pipeline_still_dispatches_when_no_new_content(
-        self, mock_poller_cls, mock_engine_cls, mock_dispatcher_cls
-    ):
+    def test_pipeline_accepts_lazy_poll_results(self, pipeline_services):
+        """Per-subreddit results may be any iterable, not just lists."""
+        mock_poller_cls, mock_engine_cls, _ = pipeline_services
+        db = MagicMock()
+        contents = [_make_content(f"post{i}") for i in range(3)]
+
+        mock_poller = mock_poller_cls.return_value
+        mock_poller.poll_all_active.return_value = {
+            "python": (c for c in contents[:2]),
+            "django": (c for c in contents[2:]),
+            "rust": (c for c in ()),
+        }
+        mock_engine_cls.return_value.process_batch.return_value = []
+
+        summary = run_pipeline(db)
+
+        passed_content = mock_engine_cls.return_value.process_batch.call_args[0][0]
+        assert passed_content == contents
+        assert summary["subreddits_polled"] == 3
+        assert summary["new_content"] == 3
+
+    def test_pipeline_still_dispatches_when_no_new_content(self, pipeline_services):
         """Dispatcher runs even with no new content (handles previously pending)."""
+        mock_poller_cls, _, mock_dispatcher_cls = pipeline_services
         db = MagicMock()
 
         mock_poller = mock_poller_cls.return_value
@@ -150,108 +201,155 @@ class TestRunPipeline:
 class TestRetentionCleanup:
     """Tests for cleanup_old_data()."""
 
-    def test_cleanup_deletes_old_records(self):
-        """Old matches and content are deleted, session is committed."""
-        db = MagicMock()
-
-        # Mock the query chain for Match
-        match_query = MagicMock()
-        match_filter = MagicMock()
-        match_filter.delete.return_value = 5
-        match_query.filter.return_value = match_filter
-
-        # Mock the query chain for RedditContent
-        content_query = MagicMock()
-        content_filter = MagicMock()
-        content_filter.delete.return_value = 10
-        content_query.filter.return_value = content_filter
-
-        # db.query returns the right mock based on the model
-        def query_side_effect(model):
-            from app.models.matches import Match
-            from app.models.content import RedditContent
-            if model is Match:
-                return match_query
-            elif model is RedditContent:
-                return content_query
-            return MagicMock()
-
-        db.query.side_effect = query_side_effect
+    @staticmethod
+    def _seed(session, count, age_days, prefix):
+        """Insert *count* content rows, each with one match, *age_days* old."""
+        client = session.query(Client).first()
+        if client is None:
+            client = Client(email="retention@example.com", password_hash="x")
+            session.add(client)
+            session.flush()
+            session.add(Keyword(client_id=client.id, phrases=["retention"]))
+            session.flush()
+        keyword = session.query(Keyword).first()
+        stamp = datetime.now(timezone.utc) - timedelta(days=age_days)
+
+        for i in range(count):
+            content = RedditContent(
+                reddit_id=f"{prefix}{i}",
+                subreddit="python",
+                content_type=ContentType.post,
+                body="body",
+                author="author",
+                normalized_text="body",
+                content_hash=f"{prefix}-hash-{i}",
+                reddit_created_at=stamp,
+                fetched_at=stamp,
+            )
+            session.add(content)
+            session.flush()
+            session.add(Match(
+                client_id=client.id,
+                keyword_id=keyword.id,
+                content_id=content.id,
+                content_type=ContentType.post,
+                subreddit="python",
+                matched_phrase="retention",
+                snippet="body",
+                full_text="body",
+                reddit_url=f"https://reddit.com/r/python/comments/{prefix}{i}",
+                reddit_author="author",
+                detected_at=stamp,
+            ))
+        session.commit()
+
+    def test_cleanup_deletes_old_records(self, db_session):
+        """Only rows older than the cutoff are deleted, across several batches."""
+        self._seed(db_session, 5, age_days=120, prefix="old")
+        self._seed(db_session, 5, age_days=10, prefix="new")
+
+        result = cleanup_old_data(db_session, retention_days=90, batch_size=2)
+
+        assert result == {"content_deleted": 5, "matches_deleted": 5}
+        assert db_session.query(Match).count() == 5
+        remaining = {c.reddit_id for c in db_session.query(RedditContent)}
+        assert remaining == {f"new{i}" for i in range(5)}
+
+    def test_cleanup_commits_each_batch(self):
+        """Each non-empty batch is committed separately."""
+        db, executed = _make_retention_db(match_rows=[1000, 500], content_rows=[10])
 
         result = cleanup_old_data(db, retention_days=90)
 
-        assert result["matches_deleted"] == 5
+        assert result["matches_deleted"] == 1500
         assert result["content_deleted"] == 10
-        db.commit.assert_called_once()
+        # One commit per non-empty batch
+        assert db.commit.call_count == 3
+        # A short batch ends the loop without a final empty DELETE
+        assert len(executed) == 3
+        db.query.assert_not_called()
 
     def test_cleanup_respects_retention_days(self):
         """The cutoff date should be retention_days ago."""
-        db = MagicMock()
-
-        match_query = MagicMock()
-        match_filter = MagicMock()
-        match_filter.delete.return_value = 0
-        match_query.filter.return_value = match_filter
-
-        content_query = MagicMock()
-        content_filter = MagicMock()
-        content_filter.delete.return_value = 0
-        content_query.filter.return_value = content_filter
-
-        def query_side_effect(model):
-            from app.models.matches import Match
-            from app.models.content import RedditContent
-            if model is Match:
-                return match_query
-            elif model is RedditContent:
-                return content_query
-            return MagicMock()
-
-        db.query.side_effect = query_side_effect
+        db, executed = _make_retention_db()
 
+        before = datetime.now(timezone.utc) - timedelta(days=30)
         result = cleanup_old_data(db, retention_days=30)
+        after = datetime.now(timezone.utc) - timedelta(days=30)
 
         assert result["matches_deleted"] == 0
         assert result["content_deleted"] == 0
-        # Both Match and RedditContent queries should have been filtered
-        match_query.filter.assert_called_once()
-        content_query.filter.assert_called_once()
+        assert len(executed) == 2
+        for stmt in executed:
+            params = stmt.compile().params
+            cutoffs = [v for v in params.values() if isinstance(v, datetime)]
+            assert len(cutoffs) == 1
+            assert before <= cutoffs[0] <= after
+        db.commit.assert_not_called()
+
+    def test_cleanup_batches_deletions(self):
+        """Each DELETE is limited to batch_size rows via an id subquery."""
+        db, executed = _make_retention_db()
+
+        cleanup_old_data(db, retention_days=30, batch_size=250)
+
+        sql = str(executed[-1].compile(compile_kwargs={"literal_binds": True}))
+        assert sql.startswith("DELETE FROM reddit_content")
+        assert "LIMIT 250" in sql
 
     def test_cleanup_deletes_matches_before_content(self):
         """Matches are deleted before content due to FK constraints."""
-        db = MagicMock()
-        call_order = []
-
-        match_query = MagicMock()
-        match_filter = MagicMock()
-        def match_delete(**kwargs):
-            call_order.append("match")
-            return 0
-        match_filter.delete.side_effect = match_delete
-        match_query.filter.return_value = match_filter
-
-        content_query = MagicMock()
-        content_filter = MagicMock()
-        def content_delete(**kwargs):
-            call_order.append("content")
-            return 0
-        content_filter.delete.side_effect = content_delete
-        content_query.filter.return_value = content_filter
-
-        def query_side_effect(model):
-            from app.models.matches import Match
-            from app.models.content import RedditContent
-            if model is Match:
-                return match_query
-            elif model is RedditContent:
-                return content_query
-            return MagicMock()
-
-        db.query.side_effect = query_side_effect
+        db, executed = _make_retention_db()
+
+        cleanup_old_data(db)
+
+        assert [stmt.table.name for stmt in executed] == ["matches", "reddit_content"]
+
+    def test_cleanup_sets_random_page_cost_on_postgres(self):
+        """Each PostgreSQL batch transaction starts with the planner hint."""
+        db, executed = _make_retention_db(match_rows=[5], dialect="postgresql")
+
+        cleanup_old_data(db, batch_size=5)
+
+        statements = [str(stmt) for stmt in executed]
+        hints = [s for s in statements if s.startswith("SET LOCAL")]
+        assert hints == ["SET LOCAL random_page_cost = 1.1"] * 3
+        assert statements[0].startswith("SET LOCAL")
+        assert statements[2].startswith("SET LOCAL")
+
+    def test_cleanup_uses_one_db_side_cutoff_on_postgres(self):
+        """On PostgreSQL now() is read once and both passes bind that cutoff."""
+        db, executed = _make_retention_db(
+            match_rows=[5, 1], content_rows=[5, 1], dialect="postgresql"
+        )
+
+        cleanup_old_data(db, retention_days=30, batch_size=5)
+
+        db.scalar.assert_called_once()
+        assert "now()" in str(db.scalar.call_args.args[0])
+        deletes = [stmt for stmt in executed if getattr(stmt, "table", None) is not None]
+        assert [stmt.table.name for stmt in deletes] == ["matches"] * 2 + ["reddit_content"] * 2
+        for stmt in deletes:
+            compiled = stmt.compile(dialect=postgresql.dialect())
+            assert "now()" not in str(compiled)
+            cutoffs = [v for v in compiled.params.values() if isinstance(v, datetime)]
+            assert cutoffs == [_DB_NOW - timedelta(days=30)]
+
+    def test_cleanup_skips_planner_hint_on_other_dialects(self):
+        """SET LOCAL is PostgreSQL-only and is not sent to SQLite."""
+        db, executed = _make_retention_db(dialect="sqlite")
 
         cleanup_old_data(db)
 
-        assert call_order == ["match", "content"]
+        assert not any(str(stmt).startswith("SET LOCAL") for stmt in executed)
+
+    def test_retention_indexes_present(self):
+        """The cutoff columns used by the retention deletes are indexed."""
+        match_indexes = {i.name for i in Match.__table__.indexes}
+        content_indexes = {i.name for i in RedditContent.__table__.indexes}
+
+        assert "ix_matches_detected_at" in match_indexes
+        assert "ix_reddit_content_fetched_at" in content_indexes
 
 
 # ---------------------------------------------------------------------------
@@ -262,24 +360,27 @@ class TestRetentionCleanup:
 class TestScheduler:
     """Tests for scheduler configuration in main.py."""
 
-    def test_create_scheduler_has_pipeline_job(self):
-        """Scheduler should have a pipeline interval job."""
-        scheduler = create_scheduler()
-        jobs = scheduler.get_jobs()
-        job_ids = [j.id for j in jobs]
-        assert "pipeline" in job_ids
+    @pytest.fixture(scope="class")
+    @classmethod
+    def scheduler(cls):
+        """A default-configured scheduler, built once for the read-only tests."""
+        return create_scheduler()
 
-    def test_create_scheduler_has_retention_job(self):
-        """Scheduler should have a retention cron job."""
-        scheduler = create_scheduler()
+    def test_scheduler_jobs(self, scheduler):
+        """Scheduler should have exactly the pipeline and retention jobs."""
         jobs = scheduler.get_jobs()
-        job_ids = [j.id for j in jobs]
-        assert "retention" in job_ids
+        assert len(jobs) == 2
+        assert {j.id for j in jobs} == {"pipeline", "retention"}
 
-    def test_scheduler_job_count(self):
-        """Scheduler should have exactly 2 jobs."""
-        scheduler = create_scheduler()
-        assert len(scheduler.get_jobs()) == 2
+    def test_create_pipeline_scheduler_only_pipeline(self):
+        """The pipeline-only scheduler carries just the pipeline job."""
+        scheduler = create_pipeline_scheduler()
+        assert [j.id for j in scheduler.get_jobs()] == ["pipeline"]
+
+    def test_create_retention_scheduler_only_retention(self):
+        """The retention-only scheduler carries just the retention job."""
+        scheduler = create_retention_scheduler()
+        assert [j.id for j in scheduler.get_jobs()] == ["retention"]
 
     @patch("app.worker.main.POLL_INTERVAL_MINUTES", 15)
     def test_pipeline_job_interval_configurable(self):
@@ -289,6 +390,19 @@ class TestScheduler:
         # APScheduler 3.x stores interval as trigger.interval
         assert pipeline.trigger.interval == timedelta(minutes=15)
 
+    def test_jobs_never_overlap_and_coalesce_missed_runs(self, scheduler):
+        """Each job runs one instance at a time and collapses missed runs."""
+        for job in scheduler.get_jobs():
+            assert job.max_instances == 1
+            assert job.coalesce is True
+
+    @patch("app.worker.main.POLL_INTERVAL_MINUTES", 15)
+    def test_late_runs_are_not_dropped(self):
+        """Jobs tolerate starting late instead of being skipped as misfires."""
+        scheduler = create_scheduler()
+        assert scheduler.get_job("pipeline").misfire_grace_time == 15 * 60
+        assert scheduler.get_job("retention").misfire_grace_time == 3600
+
 
 # ---------------------------------------------------------------------------
 # Job wrapper tests
@@ -298,61 +412,43 @@ class TestScheduler:
 class TestJobWrappers:
     """Tests for pipeline_job() and retention_job() wrappers in main.py."""
 
-    @patch("app.worker.main.run_pipeline")
+    @pytest.mark.parametrize(
+        "job, target, side_effect",
+        [
+            (pipeline_job, "app.worker.main.run_pipeline", None),
+            (pipeline_job, "app.worker.main.run_pipeline", RuntimeError("boom")),
+            (retention_job, "app.worker.main.cleanup_old_data", None),
+            (retention_job, "app.worker.main.cleanup_old_data", RuntimeError("boom")),
+        ],
+        ids=["pipeline", "pipeline-error", "retention", "retention-error"],
+    )
     @patch("app.worker.main.SessionLocal")
-    def test_pipeline_job_opens_and_closes_session(
-        self, mock_session_local, mock_run
+    def test_job_opens_and_closes_session(
+        self, mock_session_local, job, target, side_effect
     ):
-        """pipeline_job should create a session, run the pipeline, then close."""
-        mock_session = MagicMock()
-        mock_session_local.return_value = mock_session
-        mock_run.return_value = {"subreddits_polled": 0}
+        """Each job runs on its own session and closes it, even on error."""
+        session_cm = mock_session_local.return_value
+        mock_session = session_cm.__enter__.return_value
 
-        pipeline_job()
+        with patch(target, side_effect=side_effect) as mock_work:
+            job()  # errors are logged, not raised
 
         mock_session_local.assert_called_once()
-        mock_run.assert_called_once_with(mock_session)
-        mock_session.close.assert_called_once()
-
-    @patch("app.worker.main.run_pipeline", side_effect=RuntimeError("boom"))
-    @patch("app.worker.main.SessionLocal")
-    def test_pipeline_job_closes_session_on_error(
-        self, mock_session_local, mock_run
-    ):
-        """Session is closed even when the pipeline raises an exception."""
-        mock_session = MagicMock()
-        mock_session_local.return_value = mock_session
-
-        pipeline_job()  # should not raise
-
-        mock_session.close.assert_called_once()
+        mock_work.assert_called_once()
+        assert mock_work.call_args.args[0] is mock_session
+        # Session.__exit__ closes the session
+        session_cm.__exit__.assert_called_once()
 
-    @patch("app.worker.main.RETENTION_DAYS", 90)
+    @patch("app.worker.main.RETENTION_DAYS", 30)
     @patch("app.worker.main.cleanup_old_data")
     @patch("app.worker.main.SessionLocal")
-    def test_retention_job_opens_and_closes_session(
+    def test_retention_job_uses_configured_days(
         self, mock_session_local, mock_cleanup
     ):
-        """retention_job should create a session, run cleanup, then close."""
-        mock_session = MagicMock()
-        mock_session_local.return_value = mock_session
-        mock_cleanup.return_value = {"content_deleted": 0, "matches_deleted": 0}
-
+        """retention_job passes RETENTION_DAYS through to the cleanup."""
         retention_job()
 
-        mock_session_local.assert_called_once()
-        mock_cleanup.assert_called_once_with(mock_session, retention_days=90)
-        mock_session.close.assert_called_once()
-
-    @patch("app.worker.main.cleanup_old_data", side_effect=RuntimeError("boom"))
-    @patch("app.worker.main.SessionLocal")
-    def test_retention_job_closes_session_on_error(
-        self, mock_session_local, mock_cleanup
-    ):
-        """Session is closed even when cleanup raises an exception."""
-        mock_session = MagicMock()
-        mock_session_local.return_value = mock_session
-
-        retention_job()  # should not raise
-
-        mock_session.close.assert_called_once()
+        mock_cleanup.assert_called_once_with(
+            mock_session_local.return_value.__enter__.return_value,
+            retention_days=30,
+        )